@@ -0,0 +1,134 @@
+"""Measure pypx800 throughput, latency and event loop blocking on the simulator.
+
+Run from the repository root: python benchmarks/benchmark.py --help
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+from time import perf_counter
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+# pylint: disable=wrong-import-position
+from pypx800 import X4VR, XTHL, IPX800, Relay, XDimmer  # noqa: E402
+from pypx800.simulator import IPX800Simulator  # noqa: E402
+
+USERNAME = "user"
+PASSWORD = "password"
+
+
+def scenarios(ipx: IPX800) -> dict:
+    """Return the benchmarked calls by name."""
+    return {
+        "request_api Get=R": lambda: ipx.request_api({"Get": "R"}),
+        "request_cgi SetPWM": lambda: ipx.request_cgi(
+            {"SetPWM": 1, "PWMValue": 50, "PWMDelay": 0}
+        ),
+        "global_get": ipx.global_get,
+        "Relay.status": lambda: Relay(ipx, 1).status,
+        "Relay.on": Relay(ipx, 1).on,
+        "XDimmer.level": lambda: XDimmer(ipx, 1).level,
+        "XTHL.temp": lambda: XTHL(ipx, 1).temp,
+        "X4VR.level": lambda: X4VR(ipx, 1, 1).level,
+    }
+
+
+class LoopMonitor:
+    """Measure how long the event loop is blocked."""
+
+    def __init__(self, interval: float = 0.001) -> None:
+        """Initialize object."""
+        self.interval = interval
+        self.max_lag = 0.0
+        self._task: asyncio.Task | None = None
+
+    async def _run(self) -> None:
+        """Sleep interval and record the extra delay."""
+        while True:
+            start = perf_counter()
+            await asyncio.sleep(self.interval)
+            self.max_lag = max(self.max_lag, perf_counter() - start - self.interval)
+
+    def __enter__(self):
+        """Start monitoring."""
+        self._task = asyncio.create_task(self._run())
+        return self
+
+    def __exit__(self, *_exc_info) -> None:
+        """Stop monitoring."""
+        self._task.cancel()
+
+
+async def run_scenario(call, requests: int, concurrency: int) -> dict:
+    """Run call requests times with concurrency workers, return the metrics."""
+    latencies: list[float] = []
+    remaining = iter(range(requests))
+
+    async def worker() -> None:
+        for _ in remaining:
+            start = perf_counter()
+            await call()
+            latencies.append(perf_counter() - start)
+
+    with LoopMonitor() as monitor:
+        start = perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = perf_counter() - start
+
+    latencies.sort()
+    return {
+        "rps": requests / elapsed,
+        "p50": statistics.median(latencies) * 1000,
+        "p99": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+        "blocking": monitor.max_lag * 1000,
+    }
+
+
+async def main(args: argparse.Namespace) -> None:
+    """Start the simulator and run the benchmarks."""
+    simulator = IPX800Simulator(
+        username=USERNAME,
+        password=PASSWORD,
+        latency=args.latency,
+        latency_jitter=args.jitter,
+        failure_rate=args.failure_rate,
+    )
+    async with simulator:
+        async with IPX800(
+            "127.0.0.1",
+            simulator.api_key,
+            port=simulator.port,
+            username=USERNAME,
+            password=PASSWORD,
+            specific_devices_types=["counter"],
+            max_concurrent_requests=args.max_concurrent_requests,
+        ) as ipx:
+            print(
+                f"{'scenario':<20} {'req/s':>9} {'p50 ms':>8} {'p99 ms':>8} "
+                f"{'block ms':>9} {'sent':>6}"
+            )
+            for name, call in scenarios(ipx).items():
+                if args.only and args.only not in name:
+                    continue
+                sent = simulator.requests
+                result = await run_scenario(call, args.requests, args.concurrency)
+                print(
+                    f"{name:<20} {result['rps']:>9.1f} {result['p50']:>8.2f} "
+                    f"{result['p99']:>8.2f} {result['blocking']:>9.2f} "
+                    f"{simulator.requests - sent:>6}"
+                )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--latency", type=float, default=0.005)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    parser.add_argument("--max-concurrent-requests", type=int, default=2)
+    parser.add_argument("--only", help="run the scenarios containing this text")
+    asyncio.run(main(parser.parse_args()))
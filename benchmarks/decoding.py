@@ -0,0 +1,66 @@
+"""Compare the decoding of a Get=all answer with the available JSON decoders.
+
+Run from the repository root: python benchmarks/decoding.py --help
+"""
+
+import argparse
+import json
+import os
+import sys
+import timeit
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+# pylint: disable=wrong-import-position
+from pypx800.decoder import KeySelectiveDecoder, orjson  # noqa: E402
+from pypx800.simulator import IPX800Simulator  # noqa: E402
+
+ENTITY_KEYS = ["R1", "R2", "R3", "THL1-TEMP", "THL1-HUM", "G1", "VR1-1"]
+
+
+def allocations(decode, body: bytes) -> tuple[int, int]:
+    """Return the allocated memory blocks and peak size of one decode."""
+    tracemalloc.start()
+    snapshot = tracemalloc.take_snapshot()
+    result = decode(body)
+    peak = tracemalloc.get_traced_memory()[1]
+    blocks = sum(
+        stat.count_diff
+        for stat in tracemalloc.take_snapshot().compare_to(snapshot, "filename")
+        if stat.count_diff > 0
+    )
+    tracemalloc.stop()
+    del result
+    return blocks, peak
+
+
+def main(args: argparse.Namespace) -> None:
+    """Decode the payload with each decoder and print the metrics."""
+    simulator = IPX800Simulator()
+    payload = simulator.group("all") | {"product": "IPX800_V4", "status": "Success"}
+    body = json.dumps(payload).encode()
+
+    decoders = {"json": json.loads}
+    if orjson is not None:
+        decoders["orjson"] = orjson.loads
+    keys = ENTITY_KEYS[: args.keys]
+    for name, loads in list(decoders.items()):
+        decoders[f"{name} {len(keys)} keys"] = KeySelectiveDecoder(keys, loads)
+
+    print(f"Get=all answer: {len(body)} bytes, {len(payload)} keys")
+    print(f"{'decoder':<16} {'us/decode':>10} {'blocks':>8} {'peak KB':>8}")
+    for name, decode in decoders.items():
+        seconds = timeit.timeit(lambda: decode(body), number=args.number)
+        blocks, peak = allocations(decode, body)
+        print(
+            f"{name:<16} {seconds / args.number * 1e6:>10.1f} "
+            f"{blocks:>8} {peak / 1024:>8.1f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", type=int, default=2000)
+    parser.add_argument("--keys", type=int, default=len(ENTITY_KEYS))
+    main(parser.parse_args())
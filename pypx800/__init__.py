@@ -1,39 +1,153 @@
 """Asynchronous Python client for the IPX800 v4 API."""
 
-from .ainput import AInput
-from .counter import Counter
-from .dinput import DInput
-from .ipx800 import (
-    IPX800,
-    Ipx800CannotConnectError,
-    Ipx800InvalidAuthError,
-    Ipx800RequestError,
-)
-from .relay import Relay
-from .vainput import VAInput
-from .vinput import VInput
-from .voutput import VOutput
-from .x4fp import X4FP
-from .x4vr import X4VR
-from .xdimmer import XDimmer
-from .xpwm import XPWM
-from .xthl import XTHL
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .ainput import AInput
+    from .batch import CommandBatch, CommandResult
+    from .breaker import CircuitBreaker, CircuitState
+    from .coalescer import WriteCoalescer
+    from .coordinator import Change, PollingCoordinator, Subscription
+    from .counter import Counter
+    from .dinput import DInput
+    from .fleet import IPX800Fleet
+    from .hedging import HedgePolicy
+    from .ipx800 import (
+        IPX800,
+        Ipx800CannotConnectError,
+        Ipx800CircuitOpenError,
+        Ipx800InvalidAuthError,
+        Ipx800RequestError,
+    )
+    from .metrics import REGISTRY, Histogram, MetricsRegistry, RequestEvent
+    from .motion import CoverMotion
+    from .planner import plan_groups
+    from .polling import AdaptiveSchedule, GroupSchedule
+    from .push import PushReceiver
+    from .rate import CounterRate
+    from .recorder import TimeSeriesFile, TimeSeriesRecorder
+    from .relay import Relay
+    from .retry import RetryPolicy
+    from .scheduler import Priority, RequestScheduler
+    from .shared import SharedSnapshot, SharedSnapshotPublisher
+    from .snapshot import Bitset, IPX800Snapshot
+    from .sync import SyncIPX800
+    from .vainput import VAInput
+    from .vinput import VInput
+    from .voutput import VOutput
+    from .x4fp import X4FP
+    from .x4vr import X4VR
+    from .xdimmer import XDimmer
+    from .xpwm import XPWM
+    from .xthl import XTHL
+
+# Module of each public name, imported on first use to start scripts fast
+_MODULES = {
+    "AInput": ".ainput",
+    "CommandBatch": ".batch",
+    "CommandResult": ".batch",
+    "CircuitBreaker": ".breaker",
+    "CircuitState": ".breaker",
+    "WriteCoalescer": ".coalescer",
+    "Change": ".coordinator",
+    "PollingCoordinator": ".coordinator",
+    "Subscription": ".coordinator",
+    "Counter": ".counter",
+    "DInput": ".dinput",
+    "IPX800Fleet": ".fleet",
+    "HedgePolicy": ".hedging",
+    "IPX800": ".ipx800",
+    "Ipx800CannotConnectError": ".exceptions",
+    "Ipx800CircuitOpenError": ".exceptions",
+    "Ipx800InvalidAuthError": ".exceptions",
+    "Ipx800RequestError": ".exceptions",
+    "REGISTRY": ".metrics",
+    "Histogram": ".metrics",
+    "MetricsRegistry": ".metrics",
+    "RequestEvent": ".metrics",
+    "CoverMotion": ".motion",
+    "plan_groups": ".planner",
+    "AdaptiveSchedule": ".polling",
+    "GroupSchedule": ".polling",
+    "PushReceiver": ".push",
+    "CounterRate": ".rate",
+    "TimeSeriesFile": ".recorder",
+    "TimeSeriesRecorder": ".recorder",
+    "Relay": ".relay",
+    "RetryPolicy": ".retry",
+    "Priority": ".scheduler",
+    "RequestScheduler": ".scheduler",
+    "SharedSnapshot": ".shared",
+    "SharedSnapshotPublisher": ".shared",
+    "Bitset": ".snapshot",
+    "IPX800Snapshot": ".snapshot",
+    "SyncIPX800": ".sync",
+    "VAInput": ".vainput",
+    "VInput": ".vinput",
+    "VOutput": ".voutput",
+    "X4FP": ".x4fp",
+    "X4VR": ".x4vr",
+    "XDimmer": ".xdimmer",
+    "XPWM": ".xpwm",
+    "XTHL": ".xthl",
+}
 
 __all__ = [
+    "AdaptiveSchedule",
     "AInput",
+    "Bitset",
+    "Change",
+    "CircuitBreaker",
+    "CircuitState",
+    "CommandBatch",
+    "CommandResult",
     "Counter",
+    "CounterRate",
+    "CoverMotion",
     "DInput",
+    "GroupSchedule",
+    "HedgePolicy",
+    "Histogram",
     "IPX800",
+    "IPX800Fleet",
+    "IPX800Snapshot",
+    "PollingCoordinator",
     "Ipx800CannotConnectError",
+    "Ipx800CircuitOpenError",
     "Ipx800InvalidAuthError",
     "Ipx800RequestError",
+    "MetricsRegistry",
+    "Priority",
+    "REGISTRY",
+    "PushReceiver",
     "Relay",
+    "RequestEvent",
+    "RequestScheduler",
+    "RetryPolicy",
+    "SharedSnapshot",
+    "SharedSnapshotPublisher",
+    "Subscription",
+    "SyncIPX800",
+    "TimeSeriesFile",
+    "TimeSeriesRecorder",
     "VAInput",
     "VInput",
     "VOutput",
+    "WriteCoalescer",
     "X4FP",
     "X4VR",
     "XDimmer",
     "XPWM",
     "XTHL",
+    "plan_groups",
 ]
+
+
+def __getattr__(name: str):
+    """Import a public name on first use."""
+    if name not in _MODULES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(_MODULES[name], __name__), name)
+    globals()[name] = value
+    return value
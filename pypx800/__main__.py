@@ -0,0 +1,7 @@
+"""Run the command line interface with python -m pypx800."""
+
+import sys
+
+from .cli import main
+
+sys.exit(main())
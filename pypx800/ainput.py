@@ -10,15 +10,21 @@ class AInput:
         """Initialize object."""
         self._ipx = ipx800
         self.id = analog_id
+        ipx800.register(self)
 
     @property
     def key(self) -> str:
         """Return the key to get the value from API call."""
         return f"A{self.id}"
 
+    @property
+    def group(self) -> str:
+        """Return the group to get the value from API call."""
+        return "A"
+
     @property
     async def value(self) -> float:
         """Get Analog Input value."""
-        params = {"Get": "A"}
+        params = {"Get": self.group}
         response = await self._ipx.request_api(params)
         return response[self.key]
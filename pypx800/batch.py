@@ -0,0 +1,246 @@
+"""Gather IPX800 commands and send them merged and concurrently."""
+
+from __future__ import annotations
+
+import asyncio
+import re
+from collections.abc import Awaitable, Callable
+from contextvars import ContextVar, Token
+from functools import partial
+from typing import TYPE_CHECKING, NamedTuple
+
+from .exceptions import (
+    Ipx800CannotConnectError,
+    Ipx800InvalidAuthError,
+    Ipx800RequestError,
+)
+from .metrics import OPTION_PARAMS
+
+if TYPE_CHECKING:
+    from .ipx800 import IPX800
+
+# Command names like SetR, ClearVO, SetG01, SetPulseUP02 or SetFP00
+COMMAND_PATTERN = re.compile(r"(?:Set|Clear|Toggle)(Pulse(?:UP|DOWN))?([A-Z]*)(\d*)$")
+
+CURRENT_BATCH: ContextVar[CommandBatch | None] = ContextVar(
+    "pypx800_batch", default=None
+)
+
+
+class CommandResult(NamedTuple):
+    """Result of a batched command."""
+
+    params: dict
+    success: bool
+    error: Exception | None = None
+
+
+def command_targets(params: dict) -> set[tuple[str, int | None]]:
+    """Return the outputs a command acts on, as family and id, None for all.
+
+    SetR=3 acts on ("R", 3), SetG01 on ("G", 1), SetPulseUP02 on ("VR", 2)
+    and SetFP00 on all the ("FP", None) zones.
+    """
+    return {
+        command_target(name, value) or (name, None)
+        for name, value in params.items()
+        if name not in OPTION_PARAMS
+    }
+
+
+def command_target(name: str, value) -> tuple[str, int | None] | None:
+    """Return the output of a command param, None if the name is unknown."""
+    match = COMMAND_PATTERN.match(name)
+    if match is None or not any(match.groups()[:2]):
+        return None
+    pulse, family, number = match.groups()
+    number = number or str(value)
+    number = int(number) if number.isdigit() else 0
+    return ("VR" if pulse else family, number or None)
+
+
+def command_groups(params: dict) -> set[str] | None:
+    """Return the Get groups holding the outputs of a command, None if unknown.
+
+    SetR=3 is in the R group, SetPulseUP06 in VR2 and SetPWM=3 in XPWM|3.
+    """
+    groups = set()
+    for name, value in params.items():
+        if name in OPTION_PARAMS:
+            continue
+        target = command_target(name, value)
+        if target is None:
+            return None
+        family, number = target
+        if family == "VR" and number is not None:
+            groups.add(f"VR{(number - 1) // 4 + 1}")
+        elif family == "PWM":
+            groups.add("XPWM" if number is None else f"XPWM|{number}")
+        else:
+            groups.add(family)
+    return groups
+
+
+def targets_conflict(first: set, second: set) -> bool:
+    """Return True if commands on these targets must keep their order."""
+    return any(
+        family == other_family
+        and (number is None or other_number is None or number == other_number)
+        for family, number in first
+        for other_family, other_number in second
+    )
+
+
+def merge_commands(commands: list[dict]) -> list[list[int]]:
+    """Return the commands indexes grouped by request.
+
+    Commands are merged in a same request when their params names differ and
+    keep their call order in the query string. A command using a name already
+    queued goes to a later request, as does a command on the same target as
+    one of a later request. Commands repeating a name, like SetR for many
+    relays, can not be merged and go to separate requests.
+    """
+    requests: list[list[int]] = []
+    names: list[set] = []
+    targets: list[set] = []
+    for index, params in enumerate(commands):
+        params_targets = command_targets(params)
+        request_index = 0
+        for previous_index, previous_names in enumerate(names):
+            if previous_names.intersection(params):
+                request_index = previous_index + 1
+            elif targets_conflict(targets[previous_index], params_targets):
+                request_index = max(request_index, previous_index)
+        if request_index == len(requests):
+            requests.append([])
+            names.append(set())
+            targets.append(set())
+        requests[request_index].append(index)
+        names[request_index].update(params)
+        targets[request_index].update(params_targets)
+    return requests
+
+
+async def send_ordered(requests: list[tuple[set, Callable[[], Awaitable]]]) -> None:
+    """Send requests at once, each after the previous ones on its targets."""
+    tasks: list[asyncio.Task] = []
+    for index, (targets, send) in enumerate(requests):
+        previous = [
+            tasks[previous_index]
+            for previous_index in range(index)
+            if targets_conflict(requests[previous_index][0], targets)
+        ]
+        tasks.append(asyncio.ensure_future(_send_after(previous, send)))
+    await asyncio.gather(*tasks)
+
+
+async def _send_after(
+    previous: list[asyncio.Task], send: Callable[[], Awaitable]
+) -> None:
+    """Send a request once the previous ones are done."""
+    if previous:
+        await asyncio.wait(previous)
+    await send()
+
+
+class CommandBatch:
+    """Commands gathered by IPX800.batch() and sent when leaving the context."""
+
+    def __init__(self, ipx800: IPX800) -> None:
+        """Initialize object."""
+        self._ipx = ipx800
+        self._api_commands: list[tuple[int, dict, dict | None]] = []
+        self._cgi_commands: list[tuple[int, dict, dict | None]] = []
+        self._count = 0
+        self._token: Token | None = None
+        self.results: list[CommandResult] = []
+
+    @property
+    def ipx800(self) -> IPX800:
+        """Return the IPX800 of the batch."""
+        return self._ipx
+
+    def add_api(self, params: dict, state: dict | None = None) -> None:
+        """Queue a JSON API command and the values expected after it."""
+        self._api_commands.append((self._count, params, state))
+        self._count += 1
+
+    def add_cgi(self, params: dict, state: dict | None = None) -> None:
+        """Queue a CGI command and the values expected after it."""
+        self._cgi_commands.append((self._count, params, state))
+        self._count += 1
+
+    async def _send_api(self, results: list) -> None:
+        """Send the merged JSON API commands, at once on distinct targets."""
+        commands = [params for _, params, _ in self._api_commands]
+        targets = [command_targets(params) for params in commands]
+        requests = merge_commands(commands)
+
+        async def send(request: list[int]) -> None:
+            params: dict = {}
+            for index in request:
+                params.update(commands[index])
+            error = None
+            try:
+                await self._ipx._request_api(params)
+            except (Ipx800CannotConnectError, Ipx800RequestError) as exception:
+                error = exception
+            for index in request:
+                position, command, state = self._api_commands[index]
+                if error is None:
+                    self._ipx._update_state(command, state)
+                results[position] = CommandResult(command, error is None, error)
+
+        await send_ordered(
+            [
+                (
+                    set().union(*(targets[index] for index in request)),
+                    partial(send, request),
+                )
+                for request in requests
+            ]
+        )
+
+    async def _send_cgi(self, results: list) -> None:
+        """Send the CGI commands, which can not be merged, the same way."""
+
+        async def send(position: int, params: dict, state: dict | None) -> None:
+            error = None
+            try:
+                await self._ipx._send_cgi_command(params, state)
+            except (
+                Ipx800CannotConnectError,
+                Ipx800InvalidAuthError,
+                Ipx800RequestError,
+            ) as exception:
+                error = exception
+            results[position] = CommandResult(params, error is None, error)
+
+        await send_ordered(
+            [
+                (command_targets(params), partial(send, position, params, state))
+                for position, params, state in self._cgi_commands
+            ]
+        )
+
+    async def send(self) -> list[CommandResult]:
+        """Send the queued commands and return the result of each one."""
+        results: list = [None] * self._count
+        await asyncio.gather(self._send_api(results), self._send_cgi(results))
+        self._api_commands.clear()
+        self._cgi_commands.clear()
+        self._count = 0
+        self.results = results
+        return results
+
+    async def __aenter__(self) -> CommandBatch:
+        """Start gathering the commands."""
+        self._token = CURRENT_BATCH.set(self)
+        return self
+
+    async def __aexit__(self, exc_type, *_exc_info) -> None:
+        """Send the gathered commands, unless the block raised."""
+        CURRENT_BATCH.reset(self._token)
+        self._token = None
+        if exc_type is None:
+            await self.send()
@@ -0,0 +1,49 @@
+"""Circuit breaker tracking the health of an IPX800."""
+
+from enum import Enum
+from time import monotonic
+
+
+class CircuitState(str, Enum):
+    """State of the circuit breaker."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Open after repeated connection failures, to fail fast until a probe works."""
+
+    def __init__(self, failure_threshold: int = 5, recovery_timeout: float = 30):
+        """Initialize object, a failure_threshold of 0 disables the breaker."""
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.failures = 0
+        self.opened_at: float | None = None
+        self._state = CircuitState.CLOSED
+
+    @property
+    def state(self) -> CircuitState:
+        """Return the state, half open once the recovery timeout elapsed."""
+        if (
+            self._state is CircuitState.OPEN
+            and monotonic() - self.opened_at >= self.recovery_timeout
+        ):
+            return CircuitState.HALF_OPEN
+        return self._state
+
+    def record_success(self) -> None:
+        """Close the circuit after a successful request."""
+        self.failures = 0
+        self.opened_at = None
+        self._state = CircuitState.CLOSED
+
+    def record_failure(self) -> None:
+        """Count a connection failure, open the circuit at the threshold."""
+        self.failures += 1
+        if self.failure_threshold and (
+            self._state is CircuitState.OPEN or self.failures >= self.failure_threshold
+        ):
+            self.opened_at = monotonic()
+            self._state = CircuitState.OPEN
@@ -0,0 +1,146 @@
+"""Snapshot cache of the IPX800 values."""
+
+import re
+from functools import lru_cache
+from time import monotonic
+
+from .decoder import META_KEYS
+
+# Groups not returned by a Get=all request
+GROUPS_NOT_IN_ALL = ("C", "XPWM")
+
+
+def group_family(group: str) -> str:
+    """Return the family of a Get group, like VR for VR1 or XPWM for XPWM|1-24."""
+    return group.split("|")[0].rstrip("0123456789")
+
+
+def xpwm_channels(group: str) -> range:
+    """Return the X-PWM channels requested by a XPWM|a-b or XPWM|n group."""
+    channels = group.split("|")[1]
+    first, _, last = channels.partition("-")
+    return range(int(first), int(last or first) + 1)
+
+
+def groups_overlap(first: str, second: str) -> bool:
+    """Return True if two Get groups have values in common."""
+    if "all" in (first, second):
+        other = second if first == "all" else first
+        return group_family(other) not in GROUPS_NOT_IN_ALL
+    family = group_family(first)
+    if family != group_family(second):
+        return False
+    if family in (first, second) or first == second:
+        return True
+    if family == "XPWM":
+        return bool(set(xpwm_channels(first)) & set(xpwm_channels(second)))
+    return False
+
+
+@lru_cache(maxsize=None)
+def _group_pattern(group: str) -> re.Pattern:
+    """Return the pattern of the keys answered to a Get=group request."""
+    if group == "XTHL":
+        return re.compile(r"THL\d+-")
+    if group == "FP":
+        return re.compile(r"FP\d+ Zone")
+    if group == "XPWM":
+        return re.compile(r"PWM\d+$")
+    if group.startswith("VR"):
+        return re.compile(rf"{group}-\d+$")
+    return re.compile(rf"{group}\d+$")
+
+
+def key_in_group(key: str, group: str) -> bool:
+    """Return True if a value key is answered to a Get=group request."""
+    if group == "all":
+        return not key.startswith(("C", "PWM"))
+    if group.startswith("XPWM|"):
+        return key.startswith("PWM") and key[3:].isdigit() and (
+            int(key[3:]) in xpwm_channels(group)
+        )
+    return bool(_group_pattern(group).match(key))
+
+
+class SnapshotCache:
+    """Keep the last values received from the IPX800 with their age per group."""
+
+    def __init__(
+        self, max_age: float = 0, max_age_groups: dict[str, float] | None = None
+    ) -> None:
+        """Initialize object."""
+        self._max_age = max_age
+        self._max_age_groups = max_age_groups if max_age_groups else {}
+        self._values: dict = {}
+        self._updated: dict[str, float] = {}
+        self._invalidated: dict[str, float] = {}
+
+    @property
+    def values(self) -> dict:
+        """Return a copy of all the cached values."""
+        return dict(self._values)
+
+    def max_age(self, group: str) -> float:
+        """Return the max age in seconds of a group (VR1 uses the VR setting)."""
+        if group in self._max_age_groups:
+            return self._max_age_groups[group]
+        return self._max_age_groups.get(group_family(group), self._max_age)
+
+    def updated(self, group: str) -> float | None:
+        """Return the monotonic time of the last update covering a group."""
+        times = [self._updated.get(group)]
+        family = group_family(group)
+        if group != "all" and family not in GROUPS_NOT_IN_ALL:
+            times.append(self._updated.get("all"))
+        if family == "XPWM" and "|" in group:
+            channels = xpwm_channels(group)
+            times.extend(
+                updated
+                for cached_group, updated in self._updated.items()
+                if cached_group.startswith("XPWM|")
+                and channels[0] in xpwm_channels(cached_group)
+                and channels[-1] in xpwm_channels(cached_group)
+            )
+        times = [updated for updated in times if updated is not None]
+        return max(times) if times else None
+
+    def get(self, group: str) -> dict | None:
+        """Return the cached values of the group if it is still fresh."""
+        max_age = self.max_age(group)
+        if max_age <= 0:
+            return None
+        updated = self.updated(group)
+        if updated is None or monotonic() - updated > max_age:
+            return None
+        if any(
+            invalidated >= updated
+            for invalidated_group, invalidated in self._invalidated.items()
+            if groups_overlap(group, invalidated_group)
+        ):
+            return None
+        return {
+            key: value
+            for key, value in self._values.items()
+            if key in META_KEYS or key_in_group(key, group)
+        }
+
+    def update(self, group: str, values: dict) -> None:
+        """Store the values received for a group."""
+        self._values.update(values)
+        self._updated[group] = monotonic()
+
+    def value(self, key: str, default=None):
+        """Return the last known value of a key, fresh or not."""
+        return self._values.get(key, default)
+
+    def apply(self, values: dict) -> None:
+        """Set values expected after a command, until the next update."""
+        self._values.update(values)
+
+    def invalidate(self, group: str | None = None) -> None:
+        """Mark the cached values of a group as stale, all if no group."""
+        if group is None:
+            self._updated.clear()
+            self._invalidated.clear()
+        else:
+            self._invalidated[group] = monotonic()
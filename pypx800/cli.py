@@ -0,0 +1,208 @@
+"""Command line interface to get, set and watch IPX800 values."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+from time import perf_counter
+
+# asyncio, aiohttp and the entities are imported when used, to start fast
+
+# Values of set which are commands of the entity
+SET_COMMANDS = {
+    "relay": ("on", "off", "toggle"),
+    "dimmer": ("on", "off", "toggle"),
+    "cover": ("on", "off", "stop"),
+    "va": (),
+    "counter": (),
+}
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """Parse the command line arguments."""
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument(
+        "-H",
+        "--host",
+        dest="hosts",
+        action="append",
+        help="IPX800 host, repeat for many (default: $PYPX800_HOST)",
+    )
+    common.add_argument(
+        "-k", "--api-key", default=os.environ.get("PYPX800_API_KEY", "apikey")
+    )
+    common.add_argument("-p", "--port", type=int, default=80)
+    common.add_argument("-u", "--username", default=os.environ.get("PYPX800_USER"))
+    common.add_argument("--password", default=os.environ.get("PYPX800_PASSWORD"))
+    common.add_argument("-t", "--timeout", type=float, default=5)
+
+    parser = argparse.ArgumentParser(prog="pypx800", description=__doc__)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    get = commands.add_parser("get", parents=[common], help="print values as JSON")
+    get.add_argument("group", nargs="?", help="group like R, G, VR1 (default: all)")
+
+    set_ = commands.add_parser("set", parents=[common], help="send a command")
+    set_.add_argument("kind", choices=SET_COMMANDS)
+    set_.add_argument("id", help="id, ext-id for a cover like 1-2")
+    set_.add_argument(
+        "value", help="on, off, toggle, stop, a level, a value or +n/-n for a counter"
+    )
+
+    watch = commands.add_parser("watch", parents=[common], help="print changes")
+    watch.add_argument("keys", nargs="*", help="keys like R1 A1 (default: all)")
+    watch.add_argument("-i", "--interval", type=float, default=1)
+
+    bench = commands.add_parser("bench", parents=[common], help="measure latency")
+    bench.add_argument("-n", "--requests", type=int, default=100)
+    bench.add_argument("-c", "--concurrency", type=int, default=1)
+    bench.add_argument("-g", "--group", default="R")
+
+    args = parser.parse_args(argv)
+    if not args.hosts:
+        if "PYPX800_HOST" not in os.environ:
+            parser.error("a host is required, with --host or $PYPX800_HOST")
+        args.hosts = os.environ["PYPX800_HOST"].split(",")
+    return args
+
+
+def output(args: argparse.Namespace, host: str, line: str) -> None:
+    """Print a line, prefixed by its host if there are many."""
+    print(f"{host} {line}" if len(args.hosts) > 1 else line, flush=True)
+
+
+async def get(ipx, args: argparse.Namespace) -> None:
+    """Print the values of a group or of all."""
+    if args.group:
+        values = await ipx.request_api({"Get": args.group})
+    else:
+        values = await ipx.global_get()
+    output(args, ipx.host, json.dumps(values, sort_keys=True))
+
+
+async def set_value(ipx, args: argparse.Namespace) -> None:
+    """Send a command to an entity."""
+    from . import X4VR, Counter, Relay, VAInput, XDimmer
+
+    classes = {
+        "relay": Relay,
+        "dimmer": XDimmer,
+        "cover": X4VR,
+        "va": VAInput,
+        "counter": Counter,
+    }
+    ids = [int(value) for value in args.id.split("-")]
+    entity = classes[args.kind](ipx, *ids)
+    value = args.value
+    if value in SET_COMMANDS[args.kind]:
+        await getattr(entity, value)()
+    elif args.kind == "va":
+        await entity.set_value(float(value))
+    elif args.kind == "counter" and value[:1] == "+":
+        await entity.increment(int(value[1:]))
+    elif args.kind == "counter" and value[:1] == "-":
+        await entity.decrement(int(value[1:]))
+    elif args.kind == "counter":
+        await entity.set_value(int(value))
+    elif args.kind in ("dimmer", "cover") and value.isdigit():
+        await entity.set_level(int(value))
+    else:
+        raise ValueError(f"invalid value {value} for a {args.kind}")
+    output(args, ipx.host, "OK")
+
+
+async def watch(ipx, args: argparse.Namespace) -> None:
+    """Print the changed values until interrupted."""
+    subscription = ipx.subscribe(args.keys or None)
+    ipx.start_polling(interval=args.interval)
+    async for change in subscription:
+        if change.old is not None:
+            output(args, ipx.host, f"{change.key} {change.old} -> {change.new}")
+
+
+async def bench(ipx, args: argparse.Namespace) -> None:
+    """Print the latency of reading a group."""
+    import asyncio
+
+    durations: list[float] = []
+    errors = 0
+
+    async def worker(count: int) -> None:
+        nonlocal errors
+        for _ in range(count):
+            start = perf_counter()
+            try:
+                # each read is sent, not shared with a concurrent one
+                await ipx._request_api({"Get": args.group})
+            except Exception:
+                errors += 1
+            else:
+                durations.append(perf_counter() - start)
+
+    start = perf_counter()
+    share, extra = divmod(args.requests, args.concurrency)
+    await asyncio.gather(
+        *(worker(share + (index < extra)) for index in range(args.concurrency))
+    )
+    elapsed = perf_counter() - start
+    durations.sort()
+
+    def percentile(value: float) -> float:
+        return durations[min(int(value * len(durations)), len(durations) - 1)] * 1000
+
+    summary = f"{len(durations) / elapsed:.1f} req/s, {errors} errors"
+    if durations:
+        summary += f", p50 {percentile(0.5):.1f} ms, p99 {percentile(0.99):.1f} ms"
+    output(args, ipx.host, summary)
+
+
+COMMANDS = {"get": get, "set": set_value, "watch": watch, "bench": bench}
+
+
+async def run_host(host: str, args: argparse.Namespace, session) -> bool:
+    """Run the command on a host, return False if it failed."""
+    from .ipx800 import IPX800
+
+    ipx = IPX800(
+        host,
+        args.api_key,
+        port=args.port,
+        username=args.username,
+        password=args.password,
+        request_timeout=args.timeout,
+        session=session,
+    )
+    try:
+        await COMMANDS[args.command](ipx, args)
+    except Exception as exception:
+        print(f"{host}: {exception!r}", file=sys.stderr)
+        return False
+    finally:
+        await ipx.close()
+    return True
+
+
+async def run(args: argparse.Namespace) -> bool:
+    """Run the command on all the hosts at once."""
+    import asyncio
+
+    from aiohttp import ClientSession
+
+    async with ClientSession() as session:
+        results = await asyncio.gather(
+            *(run_host(host, args, session) for host in args.hosts)
+        )
+    return all(results)
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run the command line interface."""
+    args = parse_args(argv)
+    import asyncio
+
+    try:
+        return 0 if asyncio.run(run(args)) else 1
+    except KeyboardInterrupt:
+        return 130
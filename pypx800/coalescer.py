@@ -0,0 +1,79 @@
+"""Send only the last value written to a channel, like a dragged slider."""
+
+import asyncio
+from collections.abc import Awaitable, Callable
+
+
+class _ChannelWrites:
+    """Write pending on a channel and the callers waiting for it."""
+
+    __slots__ = ("pending", "waiters", "task")
+
+    def __init__(self) -> None:
+        """Initialize object."""
+        self.pending: Callable[[], Awaitable] | None = None
+        self.waiters: list[asyncio.Future] = []
+        self.task: asyncio.Task | None = None
+
+
+class WriteCoalescer:
+    """Last write wins per channel, intermediate values are dropped.
+
+    Entities created with coalesce_writes write their level to a channel: a
+    write is sent at once (after delay seconds) if the channel is idle, else
+    it replaces the pending one. All callers resolve when the last write of
+    the channel completes, and are cancelled if the sending is cancelled.
+    """
+
+    def __init__(self, delay: float = 0) -> None:
+        """Initialize object."""
+        self.delay = delay
+        self._channels: dict[str, _ChannelWrites] = {}
+        self._dropped = 0
+
+    @property
+    def dropped_writes(self) -> int:
+        """Return the number of writes replaced by a later one."""
+        return self._dropped
+
+    async def write(self, channel: str, send: Callable[[], Awaitable]) -> None:
+        """Send a write to a channel, or replace its pending write."""
+        writes = self._channels.get(channel)
+        if writes is None:
+            writes = self._channels[channel] = _ChannelWrites()
+            writes.task = asyncio.create_task(self._send(channel, writes))
+        elif writes.pending is not None:
+            self._dropped += 1
+        writes.pending = send
+        waiter = asyncio.get_running_loop().create_future()
+        writes.waiters.append(waiter)
+        await waiter
+
+    async def _send(self, channel: str, writes: _ChannelWrites) -> None:
+        """Send the pending writes of a channel until none is left."""
+        error: Exception | None = None
+        cancelled = False
+        try:
+            if self.delay:
+                await asyncio.sleep(self.delay)
+            while writes.pending is not None:
+                send, writes.pending = writes.pending, None
+                try:
+                    await send()
+                    error = None
+                except Exception as exception:
+                    error = exception
+        except asyncio.CancelledError:
+            cancelled = True
+            raise
+        finally:
+            del self._channels[channel]
+            for waiter in writes.waiters:
+                if waiter.done():
+                    continue
+                if cancelled:
+                    waiter.cancel()
+                elif error is None:
+                    waiter.set_result(None)
+                else:
+                    waiter.set_exception(error)
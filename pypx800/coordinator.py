@@ -0,0 +1,226 @@
+"""Poll the IPX800 in background and dispatch the changed values."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import Callable, Iterable
+from time import monotonic
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+from .decoder import META_KEYS
+from .exceptions import Ipx800CannotConnectError, Ipx800RequestError
+
+if TYPE_CHECKING:
+    from .ipx800 import IPX800
+    from .polling import AdaptiveSchedule
+
+_LOGGER = logging.getLogger(__name__)
+
+_MISSING = object()
+
+
+class Change(NamedTuple):
+    """A value changed between two snapshots."""
+
+    key: str
+    old: Any
+    new: Any
+
+
+class Subscription:
+    """Async iterator over the changes of some keys.
+
+    Only the last change of each key is kept until it is read, so a slow
+    subscriber holds at most one change per key. Used as an async context
+    manager, it is closed on exit.
+    """
+
+    def __init__(
+        self, coordinator: PollingCoordinator, keys: Iterable[str] | None
+    ) -> None:
+        """Initialize object."""
+        self._coordinator = coordinator
+        self.keys = set(keys) if keys is not None else None
+        self._pending: dict[str, Change] = {}
+        self._event = asyncio.Event()
+
+    def publish(self, change: Change) -> None:
+        """Keep a change if the subscription wants it, merged with a pending one."""
+        if self.keys is not None and change.key not in self.keys:
+            return
+        pending = self._pending.pop(change.key, None)
+        if pending is not None:
+            if pending.old == change.new:
+                # back to the value known by the subscriber
+                return
+            change = Change(change.key, pending.old, change.new)
+        self._pending[change.key] = change
+        self._event.set()
+
+    def changes(self) -> list[Change]:
+        """Return the pending changes without waiting."""
+        changes = list(self._pending.values())
+        self._pending.clear()
+        return changes
+
+    def close(self) -> None:
+        """Stop receiving changes."""
+        self._coordinator.unsubscribe(self)
+
+    def __aiter__(self) -> Subscription:
+        """Async iterator."""
+        return self
+
+    async def __anext__(self) -> Change:
+        """Wait for the next change."""
+        while not self._pending:
+            self._event.clear()
+            await self._event.wait()
+        return self._pending.pop(next(iter(self._pending)))
+
+    async def __aenter__(self) -> Subscription:
+        """Async enter."""
+        return self
+
+    async def __aexit__(self, *_exc_info) -> None:
+        """Async exit."""
+        self.close()
+
+
+class PollingCoordinator:
+    """Poll the IPX800 with one loop and fan out the changes to subscribers.
+
+    Without schedule, global_get() is polled every interval seconds, else each
+    group is polled when the schedule says it is due.
+    """
+
+    def __init__(
+        self,
+        ipx800: IPX800,
+        interval: float = 5,
+        schedule: AdaptiveSchedule | None = None,
+    ) -> None:
+        """Initialize object."""
+        self._ipx = ipx800
+        self.interval = interval
+        self.schedule = schedule
+        self._values: dict = {}
+        self._subscriptions: list[Subscription] = []
+        self._poll_listeners: list[Callable[[list[Change]], None]] = []
+        self._task: asyncio.Task | None = None
+
+    @property
+    def values(self) -> dict:
+        """Return the last polled values."""
+        return dict(self._values)
+
+    @property
+    def running(self) -> bool:
+        """Return True if the background polling is running."""
+        return self._task is not None and not self._task.done()
+
+    def subscribe(self, keys: Iterable[str] | None = None) -> Subscription:
+        """Return an async iterator of the changes of the keys (all if None)."""
+        subscription = Subscription(self, keys)
+        self._subscriptions.append(subscription)
+        return subscription
+
+    def attach(self, listener) -> None:
+        """Dispatch the changes to a listener with keys and publish(change)."""
+        self._subscriptions.append(listener)
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        """Remove a subscription."""
+        if subscription in self._subscriptions:
+            self._subscriptions.remove(subscription)
+
+    def add_poll_listener(
+        self, listener: Callable[[list[Change]], None]
+    ) -> Callable[[], None]:
+        """Call listener with the changes after each poll, return its remover."""
+        self._poll_listeners.append(listener)
+        return lambda: self._poll_listeners.remove(listener)
+
+    def _polled(self, changes: list[Change]) -> None:
+        """Call the poll listeners."""
+        for listener in list(self._poll_listeners):
+            try:
+                listener(changes)
+            except Exception:
+                _LOGGER.exception("Error in IPX800 poll listener")
+
+    def publish(self, values: dict) -> list[Change]:
+        """Compare new values with the last ones and dispatch the changes."""
+        changes = [
+            Change(key, self._values.get(key), value)
+            for key, value in values.items()
+            if key not in META_KEYS and self._values.get(key, _MISSING) != value
+        ]
+        self._values.update(values)
+        for change in changes:
+            for subscription in self._subscriptions:
+                subscription.publish(change)
+        return changes
+
+    async def refresh(self) -> list[Change]:
+        """Poll the IPX800 once and dispatch the changes."""
+        if self.schedule is None:
+            changes = self.publish(await self._ipx.global_get())
+            self._polled(changes)
+            return changes
+
+        now = monotonic()
+        groups = self.schedule.due(now)
+        answers = await asyncio.gather(
+            *(self._ipx.request_api({"Get": group}) for group in groups),
+            return_exceptions=True,
+        )
+        values: dict = {}
+        errors = []
+        for group, answer in zip(groups, answers):
+            if isinstance(answer, (Ipx800CannotConnectError, Ipx800RequestError)):
+                self.schedule.failed(group, now)
+                errors.append(answer)
+            elif isinstance(answer, BaseException):
+                raise answer
+            else:
+                self.schedule.update(group, answer, now)
+                values.update(answer)
+        changes = self.publish(values)
+        if values:
+            self._polled(changes)
+        if errors:
+            raise errors[0]
+        return changes
+
+    def _next_delay(self) -> float:
+        """Return the time to wait before the next poll."""
+        if self.schedule is None:
+            return self.interval
+        return self.schedule.next_delay(monotonic())
+
+    async def _poll(self) -> None:
+        """Poll the IPX800 until cancelled."""
+        while True:
+            try:
+                await self.refresh()
+            except (Ipx800CannotConnectError, Ipx800RequestError) as exception:
+                _LOGGER.warning("Polling of %s failed: %s", self._ipx.host, exception)
+            await asyncio.sleep(self._next_delay())
+
+    def start(self) -> None:
+        """Start polling in background."""
+        if not self.running:
+            self._task = asyncio.create_task(self._poll())
+
+    async def stop(self) -> None:
+        """Stop the background polling."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
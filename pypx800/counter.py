@@ -1,6 +1,7 @@
 """IPX800 Counter."""
 
 from .ipx800 import IPX800
+from .rate import CounterRate
 
 
 class Counter:
@@ -10,30 +11,59 @@ class Counter:
         """Initialize object."""
         self._ipx = ipx800
         self.id = counter_id
+        self._rates: list[CounterRate] = []
+        ipx800.register(self)
 
     @property
     def key(self) -> str:
         """Return the key to get the value from API call."""
         return f"C{self.id}"
 
+    @property
+    def group(self) -> str:
+        """Return the group to get the value from API call."""
+        return "C"
+
     @property
     async def value(self) -> float:
         """Get Counter value."""
-        params = {"Get": "C"}
+        params = {"Get": self.group}
         response = await self._ipx.request_api(params)
         return response[self.key]
 
+    def rate(
+        self, window: float = 3600, scale: float = 1, rollover: int | None = None
+    ) -> CounterRate:
+        """Return the rate and totals of the polled and pushed values."""
+        rate = CounterRate(self.key, window, scale, rollover)
+        self._rates.append(rate)
+        self._ipx.coordinator.attach(rate)
+        return rate
+
+    def _shifted_state(self, value: int) -> dict | None:
+        """Return the state after adding value, if the current one is fresh."""
+        cached = self._ipx.cache.get("C")
+        if cached is None or self.key not in cached:
+            return None
+        return {self.key: cached[self.key] + value}
+
     async def set_value(self, value: int) -> None:
         """Set Counter value."""
         params = {f"SetC{self.id:02}": value}
-        await self._ipx.request_api(params)
+        await self._ipx.request_api(params, state={self.key: value})
+        for rate in self._rates:
+            rate.set(value)
 
     async def increment(self, value: int = 1) -> None:
         """Increment Counter value."""
         params = {f"SetC{self.id:02}": f"+{value}"}
-        await self._ipx.request_api(params)
+        await self._ipx.request_api(params, state=self._shifted_state(value))
+        for rate in self._rates:
+            rate.shift(value)
 
     async def decrement(self, value: int = 1) -> None:
         """Increment Counter value."""
         params = {f"SetC{self.id:02}": f"-{value}"}
-        await self._ipx.request_api(params)
+        await self._ipx.request_api(params, state=self._shifted_state(-value))
+        for rate in self._rates:
+            rate.shift(-value)
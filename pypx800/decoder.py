@@ -0,0 +1,50 @@
+"""Decode the IPX800 JSON API answers."""
+
+import json
+import re
+from collections.abc import Callable, Iterable
+from typing import Any
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+JsonLoads = Callable[[bytes], Any]
+
+# Keys of the API answer which are not values, always decoded to check it
+META_KEYS = ("product", "status")
+
+
+def default_json_loads() -> JsonLoads:
+    """Return the fastest JSON parser installed, orjson if available."""
+    if orjson is not None:
+        return orjson.loads
+    return json.loads
+
+
+class KeySelectiveDecoder:
+    """Decode only some keys of a flat JSON answer, without building the others.
+
+    The IPX800 answers a flat object of numbers, strings and small objects like
+    X-Dimmer {"Etat": "ON", "Valeur": 50}, so the wanted values are found in
+    the raw body and only them are parsed.
+    """
+
+    def __init__(self, keys: Iterable[str], json_loads: JsonLoads | None = None):
+        """Initialize object."""
+        self.keys = frozenset(keys).union(META_KEYS)
+        self._json_loads = json_loads or default_json_loads()
+        names = b"|".join(
+            re.escape(key.encode()) for key in sorted(self.keys, key=len, reverse=True)
+        )
+        self._pattern = re.compile(
+            rb'"(' + names + rb')"\s*:\s*(\{[^{}]*\}|"[^"]*"|[^,}\s]+)'
+        )
+
+    def __call__(self, body: bytes) -> dict:
+        """Return the wanted keys of the body."""
+        loads = self._json_loads
+        return {
+            key.decode(): loads(value) for key, value in self._pattern.findall(body)
+        }
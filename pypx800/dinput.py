@@ -10,15 +10,21 @@ class DInput:
         """Initialize object."""
         self._ipx = ipx800
         self.id = digital_id
+        ipx800.register(self)
 
     @property
     def key(self) -> str:
         """Return the key to get the value from API call."""
         return f"D{self.id}"
 
+    @property
+    def group(self) -> str:
+        """Return the group to get the value from API call."""
+        return "D"
+
     @property
     async def value(self) -> bool:
         """Get Digital Input value."""
-        params = {"Get": "D"}
+        params = {"Get": self.group}
         response = await self._ipx.request_api(params)
         return response[self.key] == 1
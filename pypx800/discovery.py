@@ -0,0 +1,80 @@
+"""Build the entities present in the IPX800 values."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from .ainput import AInput
+from .counter import Counter
+from .dinput import DInput
+from .relay import Relay
+from .snapshot import KEY_PATTERN
+from .vainput import VAInput
+from .vinput import VInput
+from .voutput import VOutput
+from .x4fp import X4FP
+from .x4vr import X4VR
+from .xdimmer import XDimmer
+from .xpwm import XPWM
+from .xthl import XTHL, XTHLTypes
+
+if TYPE_CHECKING:
+    from .ipx800 import IPX800
+
+# Entity class of the keys made of a family and an id, like R1
+ENTITY_CLASSES = {
+    "R": Relay,
+    "D": DInput,
+    "A": AInput,
+    "VA": VAInput,
+    "VI": VInput,
+    "VO": VOutput,
+    "C": Counter,
+    "G": XDimmer,
+    "PWM": XPWM,
+}
+
+XTHL_SENSORS = {sensor.value for sensor in XTHLTypes}
+
+
+def entity_of_key(key: str) -> tuple[type, tuple[int, ...]] | None:
+    """Return the entity class and ids of a value key, None if not an entity."""
+    match = KEY_PATTERN.match(key)
+    if match is None:
+        return None
+    family, number, suffix, zone = match.groups()
+    if family in ENTITY_CLASSES and suffix is None and zone is None:
+        return ENTITY_CLASSES[family], (int(number),)
+    if family == "THL" and suffix in XTHL_SENSORS:
+        return XTHL, (int(number),)
+    if family == "VR" and suffix and suffix.isdigit():
+        return X4VR, (int(number), int(suffix))
+    if family == "FP" and zone:
+        return X4FP, (int(number), int(zone))
+    return None
+
+
+def entity_keys(entity) -> list[str]:
+    """Return the value keys of an entity."""
+    if isinstance(entity, XTHL):
+        return [entity.key(sensor) for sensor in XTHLTypes]
+    return [entity.key]
+
+
+def discover_entities(ipx800: IPX800, values: dict) -> dict[str, object]:
+    """Return the entities of the value keys, created if not registered yet."""
+    index = {
+        key: entity for entity in ipx800.entities for key in entity_keys(entity)
+    }
+    created: dict[tuple, object] = {}
+    for key in values:
+        if key in index:
+            continue
+        found = entity_of_key(key)
+        if found is None:
+            continue
+        entity_class, ids = found
+        if (entity_class, ids) not in created:
+            created[(entity_class, ids)] = entity_class(ipx800, *ids)
+        index[key] = created[(entity_class, ids)]
+    return index
@@ -11,3 +11,7 @@ class Ipx800InvalidAuthError(Exception):
 
 class Ipx800RequestError(Exception):
     """Exception to indicate an error with an API request."""
+
+
+class Ipx800CircuitOpenError(Ipx800CannotConnectError):
+    """Exception to indicate the IPX800 is unreachable and calls fail fast."""
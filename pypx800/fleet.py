@@ -0,0 +1,162 @@
+"""Poll many IPX800 on one shared connection pool."""
+
+import asyncio
+import logging
+
+from aiohttp import ClientSession, TCPConnector
+
+from .exceptions import Ipx800CannotConnectError, Ipx800RequestError
+from .ipx800 import IPX800
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class IPX800Fleet:
+    """Class representing many IPX800 sharing one client session."""
+
+    def __init__(
+        self,
+        max_concurrent_polls: int = 32,
+        connections_limit: int = 100,
+        connections_limit_per_host: int = 2,
+        session: ClientSession = None,
+    ) -> None:
+        """Init a fleet of IPX800."""
+        self._controllers: dict[str, IPX800] = {}
+        self._semaphore = asyncio.Semaphore(max_concurrent_polls)
+        self._values: dict[str, dict] = {}
+        self._errors: dict[str, Exception] = {}
+        self._tasks: dict[str, asyncio.Task] = {}
+        self._interval: float | None = None
+
+        self._session = session
+        self._close_session = False
+
+        if self._session is None:
+            self._session = ClientSession(
+                connector=TCPConnector(
+                    limit=connections_limit,
+                    limit_per_host=connections_limit_per_host,
+                    ttl_dns_cache=300,
+                    keepalive_timeout=60,
+                )
+            )
+            self._close_session = True
+
+    @property
+    def controllers(self) -> dict[str, IPX800]:
+        """Return the IPX800 by host."""
+        return dict(self._controllers)
+
+    @property
+    def values(self) -> dict[str, dict]:
+        """Return the last polled values by host."""
+        return dict(self._values)
+
+    @property
+    def errors(self) -> dict[str, Exception]:
+        """Return the error of the last poll by host, for failed ones."""
+        return dict(self._errors)
+
+    def add(self, host: str, api_key: str, **kwargs) -> IPX800:
+        """Create an IPX800 using the shared session, kwargs as for IPX800.
+
+        It is polled at once if the fleet is polling.
+        """
+        ipx = IPX800(host, api_key, session=self._session, **kwargs)
+        self._controllers[host] = ipx
+        if task := self._tasks.pop(host, None):
+            task.cancel()
+        if self._interval is not None:
+            self._start_poll_loop(host, ipx, self._interval, 0)
+        return ipx
+
+    async def remove(self, host: str) -> None:
+        """Stop polling an IPX800, close and forget it."""
+        ipx = self._controllers.pop(host, None)
+        task = self._tasks.pop(host, None)
+        if task is not None:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+        self._values.pop(host, None)
+        self._errors.pop(host, None)
+        if ipx is not None:
+            await ipx.close()
+
+    async def _poll(self, host: str, ipx: IPX800) -> None:
+        """Poll one IPX800 and store its values or its error."""
+        async with self._semaphore:
+            try:
+                await ipx.coordinator.refresh()
+            except (Ipx800CannotConnectError, Ipx800RequestError) as exception:
+                if self._controllers.get(host) is ipx:
+                    self._errors[host] = exception
+                return
+        if self._controllers.get(host) is not ipx:
+            # removed while polled
+            return
+        self._values[host] = ipx.coordinator.values
+        self._errors.pop(host, None)
+
+    async def poll_all(self) -> dict[str, dict | Exception]:
+        """Poll all the IPX800 in parallel, return values or error by host."""
+        await asyncio.gather(
+            *(self._poll(host, ipx) for host, ipx in self._controllers.items())
+        )
+        return {
+            host: self._errors.get(host, self._values.get(host))
+            for host in self._controllers
+        }
+
+    async def _poll_loop(self, host: str, ipx: IPX800, interval: float, delay: float):
+        """Poll one IPX800 every interval seconds after a first delay."""
+        await asyncio.sleep(delay)
+        while True:
+            await self._poll(host, ipx)
+            if host in self._errors:
+                _LOGGER.warning("Polling of %s failed: %s", host, self._errors[host])
+            await asyncio.sleep(interval)
+
+    def _start_poll_loop(
+        self, host: str, ipx: IPX800, interval: float, delay: float
+    ) -> None:
+        """Start polling one IPX800 in background."""
+        self._tasks[host] = asyncio.create_task(
+            self._poll_loop(host, ipx, interval, delay)
+        )
+
+    def start_polling(self, interval: float = 5) -> None:
+        """Poll all the IPX800 in background, spread over the interval.
+
+        The IPX800 added while polling are polled too.
+        """
+        if self._interval is not None:
+            return
+        self._interval = interval
+        step = interval / max(len(self._controllers), 1)
+        for index, (host, ipx) in enumerate(self._controllers.items()):
+            self._start_poll_loop(host, ipx, interval, index * step)
+
+    async def stop_polling(self) -> None:
+        """Stop the background polling."""
+        tasks, self._tasks = list(self._tasks.values()), {}
+        self._interval = None
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def close(self) -> None:
+        """Stop polling and close the shared client session."""
+        await self.stop_polling()
+        for ipx in self._controllers.values():
+            await ipx.close()
+        if self._session and self._close_session:
+            await self._session.close()
+
+    async def __aenter__(self):
+        """Async enter."""
+        return self
+
+    async def __aexit__(self, *_exc_info) -> None:
+        """Async exit."""
+        await self.close()
@@ -0,0 +1,95 @@
+"""Hedge slow reads with a second identical request."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from collections.abc import Awaitable, Callable
+from time import perf_counter
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .metrics import RequestTrace
+
+
+class HedgePolicy:
+    """Send a second identical read when the first one is slower than usual.
+
+    The hedge is sent after the percentile of the recent read durations, and
+    the first answer wins. Each read earns max_extra_load hedge tokens, up to
+    burst, and a hedge spends one, so hedges stay below this share of reads.
+    """
+
+    def __init__(
+        self,
+        percentile: float = 0.95,
+        max_extra_load: float = 0.05,
+        min_delay: float = 0.02,
+        min_samples: int = 20,
+        window: int = 200,
+        burst: float = 5,
+    ) -> None:
+        """Initialize object."""
+        self.percentile = percentile
+        self.max_extra_load = max_extra_load
+        self.min_delay = min_delay
+        self.min_samples = min_samples
+        self.burst = burst
+        self.hedges = 0
+        self.hedge_wins = 0
+        self._durations: deque[float] = deque(maxlen=window)
+        self._tokens = 0.0
+
+    @property
+    def delay(self) -> float | None:
+        """Return the time before hedging a read, None while learning it."""
+        if len(self._durations) < self.min_samples:
+            return None
+        durations = sorted(self._durations)
+        index = min(int(self.percentile * len(durations)), len(durations) - 1)
+        return max(durations[index], self.min_delay)
+
+    def _take_token(self) -> bool:
+        """Spend a hedge token if one is available."""
+        if self._tokens < 1:
+            return False
+        self._tokens -= 1
+        return True
+
+    async def call(
+        self, request: Callable[[], Awaitable], trace: RequestTrace | None = None
+    ):
+        """Await a read, hedged by a second one if it is too slow."""
+        self._tokens = min(self._tokens + self.max_extra_load, self.burst)
+        delay = self.delay
+        start = perf_counter()
+        first = asyncio.ensure_future(request())
+        if delay is None:
+            result = await first
+            self._durations.append(perf_counter() - start)
+            return result
+
+        pending = {first}
+        try:
+            done, pending = await asyncio.wait(pending, timeout=delay)
+            if pending and self._take_token():
+                self.hedges += 1
+                if trace is not None:
+                    trace.hedges += 1
+                pending.add(asyncio.ensure_future(request()))
+            errors = []
+            while True:
+                for task in done:
+                    if task.exception() is None:
+                        self.hedge_wins += task is not first
+                        self._durations.append(perf_counter() - start)
+                        return task.result()
+                    errors.append(task.exception())
+                if not pending:
+                    raise errors[0]
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+        finally:
+            for task in pending:
+                task.cancel()
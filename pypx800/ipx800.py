@@ -1,17 +1,42 @@
 """Get information and control a GCE IPX800v4."""
 
 import asyncio
+import logging
 import socket
-from time import sleep
+from collections.abc import Awaitable, Callable, Iterator
+from functools import partial
+from time import perf_counter
 
 from aiohttp import BasicAuth, ClientError, ClientSession
 from async_timeout import timeout
 
+from .batch import CURRENT_BATCH, CommandBatch, command_groups
+from .breaker import CircuitBreaker, CircuitState
+from .cache import SnapshotCache
+from .coalescer import WriteCoalescer
+from .coordinator import PollingCoordinator, Subscription
+from .decoder import JsonLoads, KeySelectiveDecoder, default_json_loads
 from .exceptions import (
     Ipx800CannotConnectError,
+    Ipx800CircuitOpenError,
     Ipx800InvalidAuthError,
     Ipx800RequestError,
 )
+from .hedging import HedgePolicy
+from .metrics import (
+    REGISTRY,
+    MetricsRegistry,
+    RequestEvent,
+    RequestTrace,
+    request_group,
+)
+from .planner import plan_groups
+from .polling import AdaptiveSchedule
+from .retry import RetryPolicy
+from .scheduler import Priority, RequestScheduler
+from .snapshot import IPX800Snapshot
+
+_LOGGER = logging.getLogger(__name__)
 
 
 class IPX800:
@@ -29,6 +54,18 @@ class IPX800:
         request_timeout: int = 5,
         request_checkstatus: bool = True,
         session: ClientSession = None,
+        request_deadline: float | None = None,
+        retry_policy: RetryPolicy | None = None,
+        cache_max_age: float = 0,
+        cache_max_age_groups: dict[str, float] | None = None,
+        max_concurrent_requests: int = 2,
+        json_loads: JsonLoads | None = None,
+        decode_keys: list[str] | str | None = None,
+        metrics_registry: MetricsRegistry | None = None,
+        minimal_queries: bool = False,
+        circuit_breaker: CircuitBreaker | None = None,
+        coalesce_delay: float = 0,
+        hedge_policy: HedgePolicy | None = None,
     ) -> None:
         """Init a IPX800v4 API."""
         self.host = host
@@ -40,8 +77,28 @@ class IPX800:
         self._request_retries = request_retries
         self._request_timeout = request_timeout
         self._request_checkstatus = request_checkstatus
+        self._scheduler = RequestScheduler(max_concurrent_requests)
+        self._breaker = circuit_breaker or CircuitBreaker()
+        self._probe: asyncio.Future | None = None
+        self._json_loads = json_loads or default_json_loads()
+        self._selected_keys: frozenset[str] | None = None
+        self._key_decoder: KeySelectiveDecoder | None = None
+        self._metrics = metrics_registry or REGISTRY
+        self._request_hooks: list[Callable[[RequestEvent], None]] = [
+            self._metrics.observe
+        ]
+        self._hedge_policy = hedge_policy
+        # retries fit in the timeout of one attempt unless a deadline is set
+        self._retry_policy = retry_policy or RetryPolicy(
+            attempts=request_retries,
+            deadline=request_timeout if request_deadline is None else request_deadline,
+        )
 
         self._devices_types = specific_devices_types if specific_devices_types else []
+        self._minimal_queries = minimal_queries
+        self._entities: dict[tuple, object] = {}
+        self._entity_index: dict[str, object] = {}
+        self.decode_keys = decode_keys
 
         self._api_url = f"http://{host}:{port}/api/xdevices.json"
         self._cgi_url = f"http://{host}:{port}/user/api.cgi"
@@ -49,39 +106,319 @@ class IPX800:
         self._session = session
         self._close_session = False
 
+        self._inflight_requests: dict[tuple, asyncio.Future] = {}
+        self._coalesced_requests = 0
+        self._cache = SnapshotCache(cache_max_age, cache_max_age_groups)
+        self._coalescer = WriteCoalescer(coalesce_delay)
+        self._coordinator = PollingCoordinator(self)
+
         if self._session is None:
             self._session = ClientSession()
             self._close_session = True
 
-    async def request_api(self, params: dict) -> dict:
-        """Make a request to get the IPX800 JSON API."""
-        params_with_api = {"key": self._api_key}
-        params_with_api.update(params)
+    @property
+    def coalesced_requests(self) -> int:
+        """Return the number of API requests saved by sharing in-flight reads."""
+        return self._coalesced_requests
+
+    @property
+    def cache(self) -> SnapshotCache:
+        """Return the snapshot cache of the last received values."""
+        return self._cache
+
+    def batch(self) -> CommandBatch:
+        """Return a context gathering the commands to send them together."""
+        return CommandBatch(self)
+
+    def _current_batch(self) -> CommandBatch | None:
+        """Return the batch gathering the commands of this IPX800, if any."""
+        batch = CURRENT_BATCH.get()
+        if batch is not None and batch.ipx800 is self:
+            return batch
+        return None
+
+    @property
+    def scheduler(self) -> RequestScheduler:
+        """Return the request scheduler, with its queue metrics."""
+        return self._scheduler
+
+    @property
+    def decode_keys(self) -> frozenset[str] | None:
+        """Return the only keys decoded from the API answers, None for all."""
+        if self._selected_keys is None:
+            return None
+        return self._key_decoder_of_entities().keys
+
+    @decode_keys.setter
+    def decode_keys(self, keys: list[str] | str | None) -> None:
+        """Decode only these keys and those of the registered entities.
 
+        With "entities", only the keys of the registered entities, all if None.
+        """
+        if keys is None:
+            self._selected_keys = None
+        elif keys == "entities":
+            self._selected_keys = frozenset()
+        else:
+            self._selected_keys = frozenset(keys)
+        self._key_decoder = None
+
+    def _key_decoder_of_entities(self) -> KeySelectiveDecoder:
+        """Return the decoder of the selected keys and of the entities keys."""
+        if self._key_decoder is None:
+            # entity modules import this one
+            from .discovery import entity_keys
+
+            keys = set(self._selected_keys or ())
+            for entity in self._entities.values():
+                keys.update(entity_keys(entity))
+            self._key_decoder = KeySelectiveDecoder(keys, self._json_loads)
+        return self._key_decoder
+
+    def _decode(self, body: bytes) -> dict:
+        """Decode an API answer, only the selected keys if some are."""
+        if self._selected_keys is None:
+            return self._json_loads(body)
+        return self._key_decoder_of_entities()(body)
+
+    @property
+    def health(self) -> CircuitState:
+        """Return the health of the IPX800 from the circuit breaker state."""
+        return self._breaker.state
+
+    @property
+    def circuit_breaker(self) -> CircuitBreaker:
+        """Return the circuit breaker."""
+        return self._breaker
+
+    async def _guarded(self, request: Callable[[], Awaitable]):
+        """Await a request unless the circuit is open, and track the health."""
+        state = self._breaker.state
+        if state is CircuitState.OPEN:
+            raise Ipx800CircuitOpenError("IPX800 unreachable, circuit open.")
+        if state is CircuitState.HALF_OPEN:
+            if self._probe is None:
+                self._probe = asyncio.ensure_future(self._probe_health())
+                self._probe.add_done_callback(self._release_probe)
+            if not await asyncio.shield(self._probe):
+                raise Ipx800CircuitOpenError("IPX800 unreachable, circuit open.")
         try:
-            request_retries = self._request_retries
-            while request_retries > 0:
-                async with timeout(self._request_timeout):
-                    response = await self._session.get(
-                        self._api_url,
-                        params=params_with_api,
-                    )
+            result = await request()
+        except Ipx800CircuitOpenError:
+            raise
+        except Ipx800CannotConnectError:
+            self._breaker.record_failure()
+            raise
+        self._breaker.record_success()
+        return result
 
-                if response.status:
-                    content = await response.json()
-                    response.close()
+    async def _probe_health(self) -> bool:
+        """Send one cheap request to know if the IPX800 answers again."""
+        try:
+            await self._request_api_attempt(
+                {"key": self._api_key, "Get": "R"},
+                Priority.READ,
+                None,
+                RequestTrace(),
+            )
+        except Ipx800CannotConnectError:
+            self._breaker.record_failure()
+            return False
+        except Ipx800RequestError:
+            pass
+        self._breaker.record_success()
+        return True
 
-                    if (
-                        not self._request_checkstatus
-                        or content.get("status") == "Success"
-                    ):
-                        return content
+    def _release_probe(self, _probe: asyncio.Future) -> None:
+        """Forget the finished health probe."""
+        self._probe = None
 
-                request_retries -= 1
+    @property
+    def metrics(self) -> MetricsRegistry:
+        """Return the registry of the request metrics."""
+        return self._metrics
 
-            raise Ipx800RequestError("IPX800 API request error")
+    def add_request_hook(
+        self, hook: Callable[[RequestEvent], None]
+    ) -> Callable[[], None]:
+        """Call hook with each request event, return a function removing it."""
+        self._request_hooks.append(hook)
+        return lambda: self._request_hooks.remove(hook)
+
+    async def _traced(
+        self, api: str, params: dict, trace: RequestTrace, request: Awaitable
+    ):
+        """Await a request and send its event to the request hooks."""
+        start = perf_counter()
+        error = None
+        try:
+            return await request
+        except Exception as exception:
+            error = exception
+            raise
+        finally:
+            event = RequestEvent(
+                self.host,
+                api,
+                request_group(params),
+                perf_counter() - start,
+                trace.attempts,
+                trace.timeouts,
+                trace.received_bytes,
+                error,
+                trace.hedges,
+            )
+            for hook in self._request_hooks:
+                try:
+                    hook(event)
+                except Exception:
+                    _LOGGER.exception("Error in IPX800 request hook")
+
+    @staticmethod
+    def _is_read_request(params: dict) -> bool:
+        """Return True if the params only read values from the IPX800."""
+        return list(params) == ["Get"]
+
+    @property
+    def coalescer(self) -> WriteCoalescer:
+        """Return the coalescer of the writes sent with a channel."""
+        return self._coalescer
+
+    async def request_api(
+        self, params: dict, state: dict | None = None, channel: str | None = None
+    ) -> dict:
+        """Make a request to get the IPX800 JSON API.
+
+        Concurrent reads with the same params share one HTTP round trip, and
+        reads of a group still fresh in the cache need none. Commands are
+        queued when called in a batch() context, state is the values expected
+        once the command succeeded. Of the commands sent with a same channel
+        while one is in progress, only the last one is sent.
+        """
+        if channel is not None:
+            await self._coalescer.write(
+                channel, lambda: self.request_api(params, state=state)
+            )
+            return {}
+        if not self._is_read_request(params):
+            if batch := self._current_batch():
+                batch.add_api(params, state)
+                return {}
+            return await self._send_api_command(params, state)
+
+        cached = self._cache.get(params["Get"])
+        if cached is not None:
+            return cached
+
+        request_key = tuple(params.items())
+        inflight = self._inflight_requests.get(request_key)
+        if inflight is not None:
+            self._coalesced_requests += 1
+            return dict(await asyncio.shield(inflight))
+
+        inflight = asyncio.ensure_future(self._read_api(params))
+        self._inflight_requests[request_key] = inflight
+        inflight.add_done_callback(
+            lambda future: self._release_inflight(request_key, future)
+        )
+        return await asyncio.shield(inflight)
+
+    def _release_inflight(self, request_key: tuple, future: asyncio.Future) -> None:
+        """Forget a finished in-flight read."""
+        self._inflight_requests.pop(request_key, None)
+        if not future.cancelled():
+            # mark the exception as retrieved if every waiter was cancelled
+            future.exception()
+
+    async def _read_api(self, params: dict) -> dict:
+        """Read a group from the IPX800 JSON API and cache the values."""
+        content = await self._request_api(params)
+        self._cache.update(params["Get"], content)
+        return content
+
+    async def _send_api_command(self, params: dict, state: dict | None) -> dict:
+        """Send a command to the IPX800 JSON API and update the local state."""
+        content = await self._request_api(params)
+        self._update_state(params, state)
+        return content
+
+    def _update_state(self, params: dict, state: dict | None) -> None:
+        """Apply the values expected after a command, until the next read.
+
+        Without state, the groups of the command outputs are marked stale.
+        """
+        if state is not None:
+            self._cache.apply(state)
+            return
+        groups = command_groups(params)
+        if groups is None:
+            self._cache.invalidate()
+        for group in groups or ():
+            self._cache.invalidate(group)
+
+    def _attempt_timeout(self, remaining: float | None) -> float:
+        """Return the timeout of a request attempt within the deadline."""
+        if remaining is None:
+            return self._request_timeout
+        return max(min(self._request_timeout, remaining), 0)
+
+    async def _request_api(
+        self, params: dict, json_loads: JsonLoads | None = None
+    ) -> dict:
+        """Send a request to the IPX800 JSON API, with retries.
+
+        The answer is decoded by json_loads if set, else by the IPX800 decoder.
+        """
+        priority = (
+            Priority.READ if self._is_read_request(params) else Priority.WRITE
+        )
+        params_with_api = {"key": self._api_key}
+        params_with_api.update(params)
+        trace = RequestTrace()
+
+        def attempt(remaining: float | None) -> Awaitable[dict]:
+            request = partial(
+                self._request_api_attempt,
+                params_with_api,
+                priority,
+                remaining,
+                trace,
+                json_loads,
+            )
+            if self._hedge_policy is None or priority is not Priority.READ:
+                return request()
+            return self._hedge_policy.call(request, trace)
+
+        return await self._guarded(
+            lambda: self._traced(
+                "api",
+                params,
+                trace,
+                self._retry_policy.call(attempt, write=priority is Priority.WRITE),
+            )
+        )
+
+    async def _request_api_attempt(
+        self,
+        params: dict,
+        priority: Priority,
+        remaining: float | None,
+        trace: RequestTrace,
+        json_loads: JsonLoads | None = None,
+    ) -> dict:
+        """Send one request to the IPX800 JSON API."""
+        trace.attempts += 1
+        try:
+            # the wait for a slot counts in the attempt timeout
+            async with timeout(self._attempt_timeout(remaining)):
+                async with self._scheduler.slot(priority):
+                    response = await self._session.get(self._api_url, params=params)
+                    body = await response.read()
+                    response.close()
+            trace.received_bytes += len(body)
 
         except asyncio.TimeoutError as exception:
+            trace.timeouts += 1
             raise Ipx800CannotConnectError(
                 "Timeout occurred while connecting to IPX800."
             ) from exception
@@ -90,37 +427,87 @@ class IPX800:
                 "Error occurred while communicating with the IPX800."
             ) from exception
 
-    async def request_cgi(self, params: dict) -> dict:
-        """Make a request to get the IPX800 CGI API."""
+        try:
+            content = (json_loads or self._decode)(body)
+        except ValueError as exception:
+            raise Ipx800RequestError("Invalid answer from the IPX800.") from exception
+
+        if self._request_checkstatus and content.get("status") != "Success":
+            raise Ipx800RequestError("IPX800 API request error")
+        return content
+
+    async def request_cgi(
+        self, params: dict, state: dict | None = None, channel: str | None = None
+    ) -> str:
+        """Make a request to get the IPX800 CGI API.
+
+        Commands are queued when called in a batch() context, state is the
+        values expected once the command succeeded. Of the commands sent with
+        a same channel while one is in progress, only the last one is sent.
+        """
+        if channel is not None:
+            await self._coalescer.write(
+                channel, lambda: self.request_cgi(params, state=state)
+            )
+            return ""
+        if batch := self._current_batch():
+            batch.add_cgi(params, state)
+            return ""
+        return await self._send_cgi_command(params, state)
+
+    async def _send_cgi_command(self, params: dict, state: dict | None) -> str:
+        """Send a command to the IPX800 CGI API and update the local state."""
+        content = await self._request_cgi(params)
+        self._update_state(params, state)
+        return content
+
+    async def _request_cgi(self, params: dict) -> str:
+        """Send a request to the IPX800 CGI API, with retries."""
+        trace = RequestTrace()
+        return await self._guarded(
+            lambda: self._traced(
+                "cgi",
+                params,
+                trace,
+                self._retry_policy.call(
+                    lambda remaining: self._request_cgi_attempt(
+                        params, remaining, trace
+                    ),
+                    write=True,
+                ),
+            )
+        )
+
+    async def _request_cgi_attempt(
+        self, params: dict, remaining: float | None, trace: RequestTrace
+    ) -> str:
+        """Send one request to the IPX800 CGI API."""
+        trace.attempts += 1
         auth = None
         if self._username and self._password:
             auth = BasicAuth(self._username, self._password)
 
         try:
-            request_retries = self._request_retries
-            while request_retries > 0:
-                async with timeout(self._request_timeout):
+            # the wait for a slot counts in the attempt timeout
+            async with timeout(self._attempt_timeout(remaining)):
+                async with self._scheduler.slot(Priority.WRITE):
                     response = await self._session.get(
                         self._cgi_url,
                         auth=auth,
                         params=params,
                     )
 
-                if response.status == 401:
-                    raise Ipx800InvalidAuthError("Auth failed on the IPX800.")
+                    if response.status == 401:
+                        response.close()
+                        raise Ipx800InvalidAuthError("Auth failed on the IPX800.")
 
-                if response.status:
-                    content = await response.text()
+                    body = await response.read()
                     response.close()
-                    if not self._request_checkstatus or "Success" in content:
-                        return content
-
-                request_retries -= 1
-                sleep(1)
-
-            raise Ipx800RequestError("IPX800 API request error")
+            trace.received_bytes += len(body)
+            content = body.decode(errors="replace")
 
         except asyncio.TimeoutError as exception:
+            trace.timeouts += 1
             raise Ipx800CannotConnectError(
                 "Timeout occurred while connecting to IPX800."
             ) from exception
@@ -129,6 +516,10 @@ class IPX800:
                 "Error occurred while communicating with the IPX800."
             ) from exception
 
+        if self._request_checkstatus and "Success" not in content:
+            raise Ipx800RequestError("IPX800 API request error")
+        return content
+
     async def ping(self) -> bool:
         """Return True if the IPX800 answer to API request."""
         try:
@@ -138,9 +529,47 @@ class IPX800:
             pass
         return False
 
+    def update_values(self, values: dict) -> None:
+        """Update the local state and the subscribers with values received.
+
+        The groups of the values are not marked fresh in the cache, their
+        other values may be older.
+        """
+        self._cache.apply(values)
+        self._coordinator.publish(values)
+
+    def register(self, entity) -> None:
+        """Register an entity created for this IPX800."""
+        key = entity.key if isinstance(entity.key, str) else entity.id
+        self._entities[(type(entity).__name__, entity.group, key)] = entity
+        if self._selected_keys is not None:
+            # decode its keys too, the cached values lack them
+            self._key_decoder = None
+            self._cache.invalidate(entity.group)
+
+    @property
+    def entities(self) -> list:
+        """Return the registered entities."""
+        return list(self._entities.values())
+
+    def planned_groups(self) -> list[str]:
+        """Return the fewest Get groups covering the registered entities."""
+        return plan_groups(entity.group for entity in self._entities.values())
+
     async def global_get(self) -> dict:
-        """Get all values from the IPX800 answer."""
-        values = await self.request_api({"Get": "all"})
+        """Get all values from the IPX800 answer.
+
+        With minimal_queries, only the groups of the registered entities.
+        """
+        if self._minimal_queries and self._entities:
+            values: dict = {}
+            for answer in await asyncio.gather(
+                *(self.request_api({"Get": group}) for group in self.planned_groups())
+            ):
+                values.update(answer)
+            return values
+
+        values = dict(await self.request_api({"Get": "all"}))
         # add counter values if present
         if "counter" in self._devices_types:
             values.update(await self.request_api({"Get": "C"}))
@@ -149,8 +578,118 @@ class IPX800:
             values.update(await self.request_api({"Get": "XPWM|1-24"}))
         return values
 
+    async def discover(self) -> dict[str, object]:
+        """Create the entities present in the IPX800 values.
+
+        Return the index of the entities by value key, also kept for
+        entity_values(). Counters and X-PWM are included if the IPX800 has
+        some, X-PWM only with username and password.
+        """
+        # entity modules import this one
+        from .discovery import discover_entities
+
+        groups = ["C", "XPWM|1-24"] if self._username and self._password else ["C"]
+        # with decode_keys, the values of the entities to discover are skipped
+        read = (
+            self.request_api
+            if self._selected_keys is None
+            else partial(self._request_api, json_loads=self._json_loads)
+        )
+        answers = await asyncio.gather(
+            read({"Get": "all"}),
+            *(read({"Get": group}) for group in groups),
+            return_exceptions=True,
+        )
+        if isinstance(answers[0], BaseException):
+            raise answers[0]
+        values: dict = {}
+        for answer in answers:
+            if isinstance(answer, dict):
+                values.update(answer)
+            elif not isinstance(answer, Ipx800RequestError):
+                raise answer
+        self._entity_index = discover_entities(self, values)
+        return self._entity_index
+
+    @property
+    def entity_index(self) -> dict[str, object]:
+        """Return the discovered entities by value key."""
+        return self._entity_index
+
+    def entity_values(self, values: dict) -> Iterator[tuple[object, str, object]]:
+        """Yield the discovered entity, key and value of each value."""
+        index = self._entity_index
+        for key, value in values.items():
+            entity = index.get(key)
+            if entity is not None:
+                yield entity, key, value
+
+    async def global_snapshot(self) -> IPX800Snapshot:
+        """Get all values from the IPX800 in a compact typed snapshot."""
+        return IPX800Snapshot.from_values(await self.global_get())
+
+    @property
+    def coordinator(self) -> PollingCoordinator:
+        """Return the polling coordinator."""
+        return self._coordinator
+
+    def poll_groups(self) -> list[str]:
+        """Return the groups polled separately to get all values.
+
+        With minimal_queries, only the groups of the registered entities,
+        else VR1, VR2... of the registered X-4VR are polled with the others.
+        """
+        if self._minimal_queries and self._entities:
+            return self.planned_groups()
+        groups = ["R", "D", "A", "VA", "VI", "VO", "G", "FP", "XTHL"]
+        groups.extend(
+            sorted(
+                {
+                    entity.group
+                    for entity in self._entities.values()
+                    if entity.group.startswith("VR")
+                }
+            )
+        )
+        if "counter" in self._devices_types:
+            groups.append("C")
+        if self._username and self._password:
+            groups.append("XPWM|1-24")
+        return groups
+
+    def start_polling(
+        self,
+        interval: float | None = None,
+        adaptive: bool = False,
+        groups: list[str] | None = None,
+        intervals: dict[str, tuple[float, float]] | None = None,
+    ) -> None:
+        """Poll in background.
+
+        Poll global_get() every interval seconds, or if adaptive, each group
+        (poll_groups() by default) on its own schedule, between the min and
+        max intervals, faster while it changes.
+        """
+        if interval is not None:
+            self._coordinator.interval = interval
+        self._coordinator.schedule = (
+            AdaptiveSchedule(groups or self.poll_groups(), intervals)
+            if adaptive
+            else None
+        )
+        self._coordinator.start()
+
+    async def stop_polling(self) -> None:
+        """Stop the background polling."""
+        await self._coordinator.stop()
+
+    def subscribe(self, keys: list[str] | None = None) -> Subscription:
+        """Return an async iterator of the polled changes of keys (all if None)."""
+        return self._coordinator.subscribe(keys)
+
     async def close(self) -> None:
         """Close open client session."""
+        await self._coordinator.stop()
         if self._session and self._close_session:
             await self._session.close()
 
@@ -0,0 +1,146 @@
+"""Instrumentation of the IPX800 requests."""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+from collections.abc import Iterator
+from typing import NamedTuple
+
+from .cache import group_family
+from .exceptions import Ipx800InvalidAuthError
+
+# Upper bounds in seconds of the request duration histogram buckets
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+# Params which are options of a command, not a command
+OPTION_PARAMS = {"key", "Time", "PWMValue", "PWMDelay"}
+
+
+def request_group(params: dict) -> str:
+    """Return a low cardinality name of a request, like Get=VR or SetG."""
+    if "Get" in params:
+        return f"Get={group_family(str(params['Get']))}"
+    names = {name.rstrip("0123456789") for name in params} - OPTION_PARAMS
+    return ",".join(sorted(names))
+
+
+class RequestEvent(NamedTuple):
+    """Outcome of a request sent to the IPX800, with all its attempts."""
+
+    host: str
+    api: str
+    group: str
+    duration: float
+    attempts: int
+    timeouts: int
+    received_bytes: int
+    error: Exception | None = None
+    hedges: int = 0
+
+    @property
+    def success(self) -> bool:
+        """Return True if the request succeeded."""
+        return self.error is None
+
+    @property
+    def retries(self) -> int:
+        """Return the number of attempts after the first one, hedges excluded."""
+        return max(self.attempts - self.hedges - 1, 0)
+
+
+class RequestTrace:
+    """Collect the data of the attempts of a request."""
+
+    __slots__ = ("attempts", "timeouts", "received_bytes", "hedges")
+
+    def __init__(self) -> None:
+        """Initialize object."""
+        self.attempts = 0
+        self.timeouts = 0
+        self.received_bytes = 0
+        self.hedges = 0
+
+
+class Histogram:
+    """Cumulative histogram like the Prometheus ones."""
+
+    def __init__(self, buckets: tuple[float, ...] = DURATION_BUCKETS) -> None:
+        """Initialize object."""
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        """Add a value."""
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def cumulative(self) -> list[tuple[float, int]]:
+        """Return the count of values lower or equal to each bound, inf last."""
+        result = []
+        total = 0
+        for bound, count in zip((*self.buckets, float("inf")), self.counts):
+            total += count
+            result.append((bound, total))
+        return result
+
+    def quantile(self, quantile: float) -> float:
+        """Return the upper bound of the bucket containing the quantile."""
+        rank = quantile * self.count
+        for bound, total in self.cumulative():
+            if total >= rank:
+                return bound
+        return float("inf")
+
+
+class MetricsRegistry:
+    """Counters and histograms of the requests, labelled by host, API and group."""
+
+    def __init__(self) -> None:
+        """Initialize object."""
+        self.counters: dict[tuple[str, tuple], float] = {}
+        self.histograms: dict[tuple[str, tuple], Histogram] = {}
+
+    def increment(self, name: str, labels: tuple, value: float = 1) -> None:
+        """Increment a counter."""
+        key = (name, labels)
+        self.counters[key] = self.counters.get(key, 0) + value
+
+    def histogram(self, name: str, labels: tuple) -> Histogram:
+        """Return a histogram, created if needed."""
+        key = (name, labels)
+        if key not in self.histograms:
+            self.histograms[key] = Histogram()
+        return self.histograms[key]
+
+    def observe(self, event: RequestEvent) -> None:
+        """Record a request event, usable as a request hook."""
+        labels = (event.host, event.api, event.group)
+        outcome = "success" if event.success else type(event.error).__name__
+        self.histogram("ipx800_request_duration_seconds", labels).observe(
+            event.duration
+        )
+        self.increment("ipx800_requests_total", (*labels, outcome))
+        self.increment("ipx800_request_retries_total", labels, event.retries)
+        self.increment("ipx800_request_timeouts_total", labels, event.timeouts)
+        self.increment("ipx800_received_bytes_total", labels, event.received_bytes)
+        self.increment("ipx800_request_hedges_total", labels, event.hedges)
+        if isinstance(event.error, Ipx800InvalidAuthError):
+            self.increment("ipx800_auth_failures_total", labels)
+
+    def samples(self) -> Iterator[tuple[str, dict, float]]:
+        """Yield the samples in the Prometheus format: name, labels, value."""
+        for (name, labels), value in self.counters.items():
+            names = ("host", "api", "group", "outcome")
+            yield name, dict(zip(names, labels)), value
+        for (name, labels), histogram in self.histograms.items():
+            base = dict(zip(("host", "api", "group"), labels))
+            for bound, total in histogram.cumulative():
+                yield f"{name}_bucket", {**base, "le": str(bound)}, total
+            yield f"{name}_count", base, histogram.count
+            yield f"{name}_sum", base, histogram.sum
+
+
+REGISTRY = MetricsRegistry()
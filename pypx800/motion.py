@@ -0,0 +1,82 @@
+"""Estimate the level of a moving cover from its travel time."""
+
+from __future__ import annotations
+
+from time import monotonic
+
+
+class CoverMotion:
+    """Level of a cover interpolated between its commands.
+
+    Levels go from 0 (closed) to 100 (open) in travel_time seconds. A pulse
+    of impulse n moves the cover for n * pulse_time seconds.
+    """
+
+    def __init__(self, travel_time: float, pulse_time: float = 1) -> None:
+        """Initialize object."""
+        self.travel_time = travel_time
+        self.pulse_time = pulse_time
+        self.confirmed = True
+        self._level: float | None = None
+        self._target: float | None = None
+        self._start = 0.0
+
+    @property
+    def speed(self) -> float:
+        """Return the level change by second."""
+        return 100 / self.travel_time
+
+    def level(self, now: float | None = None) -> float | None:
+        """Return the estimated level, None if unknown."""
+        if self._level is None or self._target is None:
+            return self._level
+        now = monotonic() if now is None else now
+        travelled = (now - self._start) * self.speed
+        if self._target > self._level:
+            return min(self._level + travelled, self._target)
+        return max(self._level - travelled, self._target)
+
+    def moving(self, now: float | None = None) -> bool:
+        """Return True while the cover is estimated to move."""
+        if self._target is None:
+            return False
+        return self.level(now) != self._target
+
+    def move(
+        self, target: float, level: float | None = None, now: float | None = None
+    ) -> None:
+        """Start moving to a target, from level if the estimate is unknown."""
+        now = monotonic() if now is None else now
+        current = self.level(now)
+        self._level = level if current is None else current
+        self._target = max(min(target, 100), 0) if self._level is not None else None
+        self._start = now
+        self.confirmed = False
+
+    def pulse(
+        self,
+        impulse: int,
+        up: bool,
+        level: float | None = None,
+        now: float | None = None,
+    ) -> None:
+        """Start moving for a pulse, from level if the estimate is unknown."""
+        now = monotonic() if now is None else now
+        current = self.level(now)
+        if current is None:
+            current = level
+        travel = impulse * self.pulse_time * self.speed
+        target = (current or 0) + (travel if up else -travel)
+        self.move(target, current, now)
+
+    def stop(self, now: float | None = None) -> None:
+        """Stop at the estimated level."""
+        self._level = self.level(now)
+        self._target = None
+        self.confirmed = False
+
+    def confirm(self, level: float) -> None:
+        """Set the level read from the IPX800."""
+        self._level = level
+        self._target = None
+        self.confirmed = True
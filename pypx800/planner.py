@@ -0,0 +1,49 @@
+"""Plan the fewest requests getting the values of the registered entities."""
+
+from collections.abc import Iterable
+
+from .cache import GROUPS_NOT_IN_ALL, group_family, xpwm_channels
+
+# Use Get=all when at least this number of groups it covers are needed
+ALL_THRESHOLD = 4
+
+# Merge X-PWM channels ranges separated by at most this number of channels
+XPWM_MAX_GAP = 2
+
+
+def xpwm_ranges(channels: Iterable[int], max_gap: int = XPWM_MAX_GAP) -> list[str]:
+    """Return the XPWM|a-b groups covering the channels in few requests."""
+    ranges: list[list[int]] = []
+    for channel in sorted(set(channels)):
+        if ranges and channel - ranges[-1][1] <= max_gap + 1:
+            ranges[-1][1] = channel
+        else:
+            ranges.append([channel, channel])
+    return [
+        f"XPWM|{first}" if first == last else f"XPWM|{first}-{last}"
+        for first, last in ranges
+    ]
+
+
+def plan_groups(groups: Iterable[str], all_threshold: int = ALL_THRESHOLD) -> list[str]:
+    """Return the fewest Get groups covering the groups."""
+    groups = set(groups)
+    channels = [
+        channel
+        for group in groups
+        if group.startswith("XPWM|")
+        for channel in xpwm_channels(group)
+    ]
+    in_all = sorted(
+        group
+        for group in groups
+        if group == "all" or group_family(group) not in GROUPS_NOT_IN_ALL
+    )
+    others = sorted(
+        group
+        for group in groups
+        if group not in in_all and not group.startswith("XPWM|")
+    )
+    if "all" in in_all or len(in_all) >= all_threshold:
+        in_all = ["all"]
+    return in_all + others + xpwm_ranges(channels)
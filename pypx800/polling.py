@@ -0,0 +1,106 @@
+"""Adaptive polling schedules of the IPX800 groups."""
+
+from collections.abc import Iterable
+
+from .cache import group_family
+from .decoder import META_KEYS
+
+# Min and max polling interval in seconds of each group family
+DEFAULT_INTERVALS = {
+    "R": (1, 30),
+    "D": (1, 30),
+    "VI": (1, 30),
+    "VO": (1, 30),
+    "G": (1, 30),
+    "VR": (1, 60),
+    "XPWM": (1, 60),
+    "FP": (10, 300),
+    "A": (5, 300),
+    "VA": (5, 300),
+    "C": (5, 300),
+    "XTHL": (10, 600),
+}
+FALLBACK_INTERVALS = (5, 300)
+
+# Interval factors when a group changed, or did not
+SPEED_UP = 0.5
+SLOW_DOWN = 1.5
+
+
+class GroupSchedule:
+    """Polling schedule of a group, faster while its values change."""
+
+    __slots__ = ("group", "min_interval", "max_interval", "interval", "next_poll")
+
+    def __init__(self, group: str, min_interval: float, max_interval: float):
+        """Initialize object, the group is due at once."""
+        self.group = group
+        self.min_interval = min_interval
+        self.max_interval = max(max_interval, min_interval)
+        self.interval = min_interval
+        self.next_poll = 0.0
+
+    def adapt(self, changed: bool, now: float) -> None:
+        """Shorten the interval if the group changed, else lengthen it."""
+        factor = SPEED_UP if changed else SLOW_DOWN
+        self.interval = min(
+            max(self.interval * factor, self.min_interval), self.max_interval
+        )
+        self.next_poll = now + self.interval
+
+
+class AdaptiveSchedule:
+    """Polling schedules of groups adapted to their observed change rate."""
+
+    def __init__(
+        self,
+        groups: Iterable[str],
+        intervals: dict[str, tuple[float, float]] | None = None,
+    ) -> None:
+        """Initialize object.
+
+        intervals overrides the min and max interval by group or family,
+        like {"XTHL": (60, 900), "VR1": (0.5, 10)}.
+        """
+        intervals = {**DEFAULT_INTERVALS, **(intervals or {})}
+        self.schedules = {
+            group: GroupSchedule(
+                group,
+                *intervals.get(
+                    group, intervals.get(group_family(group), FALLBACK_INTERVALS)
+                ),
+            )
+            for group in groups
+        }
+        self._values: dict[str, dict] = {}
+
+    @property
+    def intervals(self) -> dict[str, float]:
+        """Return the current polling interval of each group."""
+        return {group: item.interval for group, item in self.schedules.items()}
+
+    def due(self, now: float) -> list[str]:
+        """Return the groups to poll now."""
+        return [
+            group for group, item in self.schedules.items() if item.next_poll <= now
+        ]
+
+    def next_delay(self, now: float) -> float:
+        """Return the time until the next group is due."""
+        if not self.schedules:
+            return FALLBACK_INTERVALS[1]
+        next_poll = min(item.next_poll for item in self.schedules.values())
+        return max(next_poll - now, 0)
+
+    def update(self, group: str, values: dict, now: float) -> bool:
+        """Record the values polled for a group, return True if they changed."""
+        values = {key: value for key, value in values.items() if key not in META_KEYS}
+        changed = self._values.get(group) != values
+        self._values[group] = values
+        self.schedules[group].adapt(changed, now)
+        return changed
+
+    def failed(self, group: str, now: float) -> None:
+        """Retry a group which failed at its min interval."""
+        item = self.schedules[group]
+        item.next_poll = now + item.min_interval
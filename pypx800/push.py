@@ -0,0 +1,128 @@
+"""Receive the values pushed by the IPX800."""
+
+from __future__ import annotations
+
+import hmac
+import ipaddress
+from collections.abc import Iterable
+from typing import TYPE_CHECKING
+
+from aiohttp import web
+
+if TYPE_CHECKING:
+    from .ipx800 import IPX800
+
+DEFAULT_PATH = "/ipx800/push"
+
+
+def parse_value(value: str):
+    """Return a pushed value as int or float when numeric."""
+    try:
+        return int(value)
+    except ValueError:
+        pass
+    try:
+        return float(value)
+    except ValueError:
+        return value
+
+
+def parse_values(items: Iterable[tuple[str, str]]) -> dict:
+    """Parse pushed key and value pairs, X-Dimmer levels as in the API answer."""
+    values: dict = {}
+    for key, value in items:
+        key, value = key.strip(), parse_value(value.strip())
+        if not key:
+            continue
+        if key[:1] == "G" and key[1:].isdigit() and isinstance(value, int):
+            value = {"Etat": "ON" if value else "OFF", "Valeur": value}
+        values[key] = value
+    return values
+
+
+def parse_push(data: str) -> dict:
+    """Parse a push data like R1=1&G2=50&THL1-TEMP=20.5."""
+    items = (item.partition("=") for item in data.replace(";", "&").split("&"))
+    return parse_values((key, value) for key, separator, value in items if separator)
+
+
+def is_loopback(host: str) -> bool:
+    """Return True if a host only accepts connections from this machine."""
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+class PushReceiver:
+    """HTTP server receiving the IPX800 pushes and updating its values.
+
+    Configure the IPX800 push with the URL http://<host>:<port><path> and the
+    values as query string, like ?R1=$R1&D1=$D1, or as last path segment.
+    It listens on the loopback by default, other hosts require a token.
+    """
+
+    def __init__(
+        self,
+        ipx800: IPX800,
+        host: str = "127.0.0.1",
+        port: int = 8080,
+        path: str = DEFAULT_PATH,
+        token: str | None = None,
+    ) -> None:
+        """Initialize object, token is a required token query parameter."""
+        if not token and not is_loopback(host):
+            raise ValueError(f"a token is required to receive pushes on {host}")
+        self._ipx = ipx800
+        self.host = host
+        self.port = port
+        self.path = path.rstrip("/")
+        self._token = token
+        self._runner: web.AppRunner | None = None
+        self.pushes = 0
+
+        self.app = web.Application()
+        self.app.router.add_route("*", self.path, self._handle)
+        self.app.router.add_route("*", f"{self.path}/{{data}}", self._handle)
+
+    async def _handle(self, request: web.Request) -> web.Response:
+        """Handle a push."""
+        query = dict(request.query)
+        token = query.pop("token", "")
+        if self._token and not hmac.compare_digest(token, self._token):
+            return web.Response(status=401, text="Unauthorized")
+
+        values = parse_values(query.items())
+        if "data" in request.match_info:
+            values.update(parse_push(request.match_info["data"]))
+        if request.can_read_body:
+            values.update(parse_push(await request.text()))
+
+        self.pushes += 1
+        self._ipx.update_values(values)
+        return web.Response(text="OK")
+
+    async def start(self) -> None:
+        """Start serving, on a free port if port is 0."""
+        self._runner = web.AppRunner(self.app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        self.port = self._runner.addresses[0][1]
+
+    async def stop(self) -> None:
+        """Stop serving."""
+        if self._runner:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def __aenter__(self):
+        """Async enter."""
+        await self.start()
+        return self
+
+    async def __aexit__(self, *_exc_info) -> None:
+        """Async exit."""
+        await self.stop()
@@ -0,0 +1,113 @@
+"""Rates and totals of a counter computed from its values stream."""
+
+from __future__ import annotations
+
+from collections import deque
+from time import monotonic
+
+from .coordinator import Change
+
+
+class CounterRate:
+    """Rolling rate and windowed total of a counter, in O(1) per sample.
+
+    Increases are pulses multiplied by scale and rates are by second, so
+    pulses of 1 Wh with scale=3600 give a power in W. Timestamps are
+    monotonic() seconds. A value lower than the previous one is a rollover if
+    rollover is set and the previous value was in its upper half, else a
+    reset of the counter to 0.
+    """
+
+    def __init__(
+        self,
+        key: str,
+        window: float = 3600,
+        scale: float = 1,
+        rollover: int | None = None,
+    ) -> None:
+        """Initialize object."""
+        self.key = key
+        self.keys = {key}
+        self.window = window
+        self.scale = scale
+        self.rollover = rollover
+        self.value: float | None = None
+        self.total = 0.0
+        self.resets = 0
+        self.rollovers = 0
+        self._timestamp = 0.0
+        self._last_increase = (0.0, 0.0)
+        self._stale: float | None = None
+        self._increases: deque[tuple[float, float, float]] = deque()
+        self._window_total = 0.0
+
+    def _evict(self, now: float) -> None:
+        """Remove the increases older than the window."""
+        while self._increases and self._increases[0][1] <= now - self.window:
+            self._window_total -= self._increases.popleft()[2]
+
+    @property
+    def rate(self) -> float:
+        """Return the rate of the last increase, lowering while none follows."""
+        start, increase = self._last_increase
+        span = max(monotonic(), self._timestamp) - start
+        return increase * self.scale / span if span > 0 else 0.0
+
+    @property
+    def window_total(self) -> float:
+        """Return the total of the last window seconds."""
+        self._evict(monotonic())
+        return self._window_total * self.scale
+
+    @property
+    def average_rate(self) -> float:
+        """Return the average rate over the last window seconds."""
+        total = self.window_total
+        if not self._increases:
+            return 0.0
+        span = max(monotonic(), self._timestamp) - self._increases[0][0]
+        return total / span if span > 0 else 0.0
+
+    def add(self, value: float, timestamp: float | None = None) -> float:
+        """Add a sample of the counter, return its increase since the last one."""
+        timestamp = monotonic() if timestamp is None else timestamp
+        if self._stale is not None:
+            stale, self._stale = self._stale, None
+            if value == stale:
+                # read before the last write completed
+                return 0.0
+        if self.value is None:
+            self.value, self._timestamp = value, timestamp
+            return 0.0
+
+        increase = value - self.value
+        if increase < 0:
+            if self.rollover and self.value >= self.rollover / 2:
+                increase += self.rollover
+                self.rollovers += 1
+            else:
+                increase = value
+                self.resets += 1
+        self.total += increase * self.scale
+        self._last_increase = (self._timestamp, increase)
+        self._increases.append((self._timestamp, timestamp, increase))
+        self._window_total += increase
+        self._evict(timestamp)
+        self.value, self._timestamp = value, timestamp
+        return increase * self.scale
+
+    def set(self, value: float) -> None:
+        """Take into account a value written to the counter."""
+        if self.value is not None and value != self.value:
+            self._stale = self.value
+        self.value = value
+
+    def shift(self, offset: float) -> None:
+        """Take into account an offset added to the counter by a command."""
+        if self.value is not None:
+            self.set(self.value + offset)
+
+    def publish(self, change: Change) -> None:
+        """Add a polled or pushed value of the counter."""
+        if change.key == self.key and isinstance(change.new, (int, float)):
+            self.add(change.new)
@@ -0,0 +1,293 @@
+"""Record the polled values in a compact columnar time series file."""
+
+from __future__ import annotations
+
+import asyncio
+import math
+import mmap
+import os
+import struct
+from bisect import bisect_left, bisect_right
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from time import time
+from typing import TYPE_CHECKING, NamedTuple
+
+if TYPE_CHECKING:
+    from .coordinator import Subscription
+    from .ipx800 import IPX800
+
+MAGIC = b"PYPX800T"
+HEADER_SIZE = 4096
+HEADER = struct.Struct("<8sIIQ")
+ROWS_OFFSET = 16
+
+# Rows of a block, whose columns are stored one after the other
+BLOCK_ROWS = 1024
+
+VALUE = struct.Struct("<d")
+
+
+def sample_value(value) -> float:
+    """Return a polled value as float, NaN if it is not a number."""
+    if isinstance(value, dict):
+        value = value.get("Valeur")
+    elif value in ("ON", "OFF"):
+        return float(value == "ON")
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return math.nan
+
+
+class Bucket(NamedTuple):
+    """Aggregate of the values of a downsampling bucket."""
+
+    start: float
+    count: int
+    min: float
+    max: float
+    avg: float
+
+
+class _Column:
+    """Read only sequence over a column of the mapped blocks."""
+
+    def __init__(self, view: memoryview, series: TimeSeriesFile, column: int):
+        """Initialize object."""
+        self._view = view
+        self._series = series
+        self._column = column
+
+    def __len__(self) -> int:
+        """Return the number of rows."""
+        return self._series.rows
+
+    def __getitem__(self, row: int) -> float:
+        """Return the value of a row."""
+        return self._view[self._series.index(row, self._column)]
+
+
+class TimeSeriesFile:
+    """Fixed width columnar file of timestamped float values.
+
+    Rows are stored in blocks of block_rows rows, each block holding its
+    timestamps column then one column per key, so a range of one key is read
+    from a few contiguous slices of the memory mapped file.
+    """
+
+    def __init__(
+        self, path: str, keys: Iterable[str] | None = None, block_rows: int = BLOCK_ROWS
+    ) -> None:
+        """Open the file, create it with the keys if it does not exist."""
+        self.path = path
+        if os.path.exists(path):
+            self._file = open(path, "r+b")
+            magic, self.block_rows, count, self.rows = HEADER.unpack(
+                self._file.read(HEADER.size)
+            )
+            if magic != MAGIC:
+                raise ValueError(f"{path} is not a time series file")
+            names = self._file.read(HEADER_SIZE - HEADER.size).rstrip(b"\0")
+            self.keys = names.decode().split("\n") if count else []
+            if keys is not None and list(keys) != self.keys:
+                raise ValueError(f"{path} records the keys {self.keys}")
+        else:
+            if keys is None:
+                raise ValueError("keys are required to create a time series file")
+            self.keys = list(keys)
+            self.block_rows = block_rows
+            self.rows = 0
+            names = "\n".join(self.keys).encode()
+            if HEADER.size + len(names) > HEADER_SIZE:
+                raise ValueError("Too many keys for a time series file")
+            self._file = open(path, "w+b")
+            header = HEADER.pack(MAGIC, block_rows, len(self.keys), 0) + names
+            self._file.write(header.ljust(HEADER_SIZE, b"\0"))
+        self.columns = {key: column for column, key in enumerate(self.keys, 1)}
+        self._block_size = (len(self.keys) + 1) * self.block_rows
+
+    def index(self, row: int, column: int) -> int:
+        """Return the index in float values of a cell after the header."""
+        block, offset = divmod(row, self.block_rows)
+        return block * self._block_size + column * self.block_rows + offset
+
+    def append(self, timestamp: float, values: dict) -> None:
+        """Append a row, keys missing from values are stored as NaN."""
+        row = self.rows
+        if row % self.block_rows == 0:
+            self._file.truncate(
+                HEADER_SIZE + (row // self.block_rows + 1) * self._block_size * 8
+            )
+        cells = [(0, timestamp)] + [
+            (column, sample_value(values.get(key)))
+            for key, column in self.columns.items()
+        ]
+        for column, value in cells:
+            self._file.seek(HEADER_SIZE + self.index(row, column) * 8)
+            self._file.write(VALUE.pack(value))
+        self.rows += 1
+        self._file.seek(ROWS_OFFSET)
+        self._file.write(struct.pack("<Q", self.rows))
+
+    def flush(self) -> None:
+        """Write the appended rows to the file."""
+        self._file.flush()
+
+    def close(self) -> None:
+        """Close the file."""
+        self._file.close()
+
+    @contextmanager
+    def _mapped(self) -> Iterator[memoryview]:
+        """Map the file and yield its float values after the header."""
+        self.flush()
+        with mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            with memoryview(mapped) as raw, raw[HEADER_SIZE:] as data:
+                with data.cast("d") as view:
+                    yield view
+
+    def _range(
+        self, view: memoryview, start: float | None, end: float | None
+    ) -> tuple[int, int]:
+        """Return the rows of the timestamps between start and end included."""
+        timestamps = _Column(view, self, 0)
+        first = 0 if start is None else bisect_left(timestamps, start)
+        last = self.rows if end is None else bisect_right(timestamps, end)
+        return first, last
+
+    def _slices(
+        self, view: memoryview, column: int, first: int, last: int
+    ) -> Iterator[list[float]]:
+        """Yield the values of a column between two rows, a block at a time."""
+        row = first
+        while row < last:
+            count = min(self.block_rows - row % self.block_rows, last - row)
+            index = self.index(row, column)
+            with view[index : index + count] as values:
+                yield values.tolist()
+            row += count
+
+    def series(
+        self, key: str, start: float | None = None, end: float | None = None
+    ) -> list[tuple[float, float]]:
+        """Return the timestamps and values of a key between start and end."""
+        column = self.columns[key]
+        with self._mapped() as view:
+            first, last = self._range(view, start, end)
+            return list(
+                zip(
+                    (t for s in self._slices(view, 0, first, last) for t in s),
+                    (v for s in self._slices(view, column, first, last) for v in s),
+                )
+            )
+
+    def downsample(
+        self,
+        key: str,
+        bucket: float,
+        start: float | None = None,
+        end: float | None = None,
+    ) -> list[Bucket]:
+        """Return the min, max and average of a key by bucket of seconds."""
+        column = self.columns[key]
+        buckets: list[Bucket] = []
+        with self._mapped() as view:
+            first, last = self._range(view, start, end)
+            current = None
+            count = 0
+            low = high = total = 0.0
+            for times, values in zip(
+                self._slices(view, 0, first, last),
+                self._slices(view, column, first, last),
+            ):
+                for timestamp, value in zip(times, values):
+                    if math.isnan(value):
+                        continue
+                    begin = timestamp - timestamp % bucket
+                    if begin != current:
+                        if count:
+                            buckets.append(
+                                Bucket(current, count, low, high, total / count)
+                            )
+                        current, count = begin, 0
+                        low, high, total = math.inf, -math.inf, 0.0
+                    count += 1
+                    low = min(low, value)
+                    high = max(high, value)
+                    total += value
+            if count:
+                buckets.append(Bucket(current, count, low, high, total / count))
+        return buckets
+
+    def __len__(self) -> int:
+        """Return the number of rows."""
+        return self.rows
+
+    def __enter__(self):
+        """Enter."""
+        return self
+
+    def __exit__(self, *_exc_info) -> None:
+        """Exit."""
+        self.close()
+
+
+class TimeSeriesRecorder:
+    """Append a row of the keys values to a file each time some changed.
+
+    The values come from the polling of the IPX800, so start_polling() must
+    be called, or values pushed to it.
+    """
+
+    def __init__(
+        self,
+        ipx800: IPX800,
+        path: str,
+        keys: Iterable[str],
+        block_rows: int = BLOCK_ROWS,
+    ) -> None:
+        """Initialize object, the file is created if it does not exist."""
+        self._ipx = ipx800
+        self.keys = list(keys)
+        self.file = TimeSeriesFile(path, self.keys, block_rows)
+        self._subscription: Subscription | None = None
+        self._task: asyncio.Task | None = None
+
+    def record(self, values: dict, timestamp: float | None = None) -> None:
+        """Append a row of values."""
+        self.file.append(time() if timestamp is None else timestamp, values)
+
+    async def _record(self, subscription: Subscription) -> None:
+        """Record the changes until cancelled."""
+        async for _change in subscription:
+            subscription.changes()
+            self.record(self._ipx.coordinator.values)
+            self.file.flush()
+
+    def start(self) -> None:
+        """Start recording the polled values."""
+        if self._task is None:
+            self._subscription = self._ipx.subscribe(self.keys)
+            self._task = asyncio.create_task(self._record(self._subscription))
+
+    async def stop(self) -> None:
+        """Stop recording and close the file."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+            self._subscription.close()
+        self.file.close()
+
+    async def __aenter__(self):
+        """Async enter."""
+        self.start()
+        return self
+
+    async def __aexit__(self, *_exc_info) -> None:
+        """Async exit."""
+        await self.stop()
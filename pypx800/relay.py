@@ -10,30 +10,38 @@ class Relay:
         """Initialize object."""
         self._ipx = ipx800
         self.id = relay_id
+        ipx800.register(self)
 
     @property
     def key(self) -> str:
         """Return the key to get the value from API call."""
         return f"R{self.id}"
 
+    @property
+    def group(self) -> str:
+        """Return the group to get the value from API call."""
+        return "R"
+
     @property
     async def status(self) -> bool:
         """Return the current relay status."""
-        params = {"Get": "R"}
+        params = {"Get": self.group}
         response = await self._ipx.request_api(params)
         return response[self.key] == 1
 
     async def on(self) -> None:
         """Turn on a relay."""
         params = {"SetR": self.id}
-        await self._ipx.request_api(params)
+        await self._ipx.request_api(params, state={self.key: 1})
 
     async def off(self) -> None:
         """Turn off a relay."""
         params = {"ClearR": self.id}
-        await self._ipx.request_api(params)
+        await self._ipx.request_api(params, state={self.key: 0})
 
     async def toggle(self) -> None:
         """Toggle a relay."""
         params = {"ToggleR": self.id}
-        await self._ipx.request_api(params)
+        value = self._ipx.cache.value(self.key)
+        state = None if value is None else {self.key: 1 - value}
+        await self._ipx.request_api(params, state=state)
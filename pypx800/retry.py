@@ -0,0 +1,79 @@
+"""Retry policy of the IPX800 requests."""
+
+import asyncio
+import random
+from collections.abc import Awaitable, Callable
+from time import monotonic
+from typing import TypeVar
+
+from .exceptions import Ipx800CannotConnectError, Ipx800RequestError
+
+T = TypeVar("T")
+
+
+class RetryPolicy:
+    """Retry failed requests with exponential backoff, jitter and a deadline."""
+
+    def __init__(
+        self,
+        attempts: int = 3,
+        backoff: float = 0.5,
+        backoff_max: float = 5,
+        jitter: bool = True,
+        deadline: float | None = None,
+        retry_on: tuple[type[Exception], ...] = (
+            Ipx800CannotConnectError,
+            Ipx800RequestError,
+        ),
+        retry_writes_on: tuple[type[Exception], ...] = (Ipx800RequestError,),
+    ) -> None:
+        """Initialize object.
+
+        deadline is the max time in seconds for all the attempts and delays,
+        retry_on the exceptions worth another attempt, retry_writes_on those
+        of a command. A command whose connection failed may have run, sending
+        it again could toggle or increment twice.
+        """
+        self.attempts = max(attempts, 1)
+        self.backoff = backoff
+        self.backoff_max = backoff_max
+        self.jitter = jitter
+        self.deadline = deadline
+        self.retry_on = retry_on
+        self.retry_writes_on = retry_writes_on
+
+    def delay(self, retry: int) -> float:
+        """Return the delay in seconds before the retry number retry."""
+        delay = min(self.backoff_max, self.backoff * 2**retry)
+        if self.jitter:
+            return random.uniform(0, delay)
+        return delay
+
+    def should_retry(self, exception: Exception, write: bool = False) -> bool:
+        """Return True if the failure of a read or a write is worth another attempt."""
+        return isinstance(exception, self.retry_writes_on if write else self.retry_on)
+
+    async def call(
+        self, attempt: Callable[[float | None], Awaitable[T]], write: bool = False
+    ) -> T:
+        """Call attempt until it succeeds, with the remaining time as argument.
+
+        With write, attempt sends a command.
+        """
+        deadline = monotonic() + self.deadline if self.deadline else None
+        retry = 0
+        while True:
+            remaining = deadline - monotonic() if deadline else None
+            try:
+                return await attempt(remaining)
+            except Exception as exception:
+                if (
+                    not self.should_retry(exception, write)
+                    or retry + 1 >= self.attempts
+                ):
+                    raise
+                delay = self.delay(retry)
+                if deadline and monotonic() + delay >= deadline:
+                    raise
+            await asyncio.sleep(delay)
+            retry += 1
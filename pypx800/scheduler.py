@@ -0,0 +1,106 @@
+"""Limit and order the concurrent requests sent to the IPX800."""
+
+import asyncio
+import heapq
+from contextlib import asynccontextmanager
+from enum import IntEnum
+from itertools import count
+from time import monotonic
+
+
+class Priority(IntEnum):
+    """Priority of a request, the lowest goes first."""
+
+    WRITE = 0
+    READ = 1
+
+
+class RequestScheduler:
+    """Let at most max_concurrent requests run, commands before reads."""
+
+    def __init__(self, max_concurrent: int = 2) -> None:
+        """Initialize object."""
+        self.max_concurrent = max(max_concurrent, 1)
+        self._active = 0
+        self._waiters: list[tuple[int, int, asyncio.Future]] = []
+        self._sequence = count()
+        self._scheduled = 0
+        self._max_queue_depth = 0
+        self._total_wait_time = 0.0
+        self._max_wait_time = 0.0
+
+    @property
+    def active_requests(self) -> int:
+        """Return the number of requests running."""
+        return self._active
+
+    @property
+    def queue_depth(self) -> int:
+        """Return the number of requests waiting."""
+        return sum(1 for *_, waiter in self._waiters if not waiter.done())
+
+    @property
+    def max_queue_depth(self) -> int:
+        """Return the highest number of requests waiting at once."""
+        return self._max_queue_depth
+
+    @property
+    def scheduled_requests(self) -> int:
+        """Return the number of requests which went through the scheduler."""
+        return self._scheduled
+
+    @property
+    def total_wait_time(self) -> float:
+        """Return the time in seconds spent by all the requests waiting."""
+        return self._total_wait_time
+
+    @property
+    def max_wait_time(self) -> float:
+        """Return the longest time in seconds a request waited."""
+        return self._max_wait_time
+
+    @property
+    def average_wait_time(self) -> float:
+        """Return the average time in seconds a request waited."""
+        return self._total_wait_time / self._scheduled if self._scheduled else 0.0
+
+    async def _acquire(self, priority: Priority) -> None:
+        """Wait for a free slot."""
+        if self._active < self.max_concurrent and not self.queue_depth:
+            self._active += 1
+            return
+        waiter = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._sequence), waiter))
+        self._max_queue_depth = max(self._max_queue_depth, len(self._waiters))
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # the slot was given just before the cancellation
+                self._release()
+            else:
+                waiter.cancel()
+            raise
+
+    def _release(self) -> None:
+        """Give the slot to the next waiting request."""
+        while self._waiters:
+            *_, waiter = heapq.heappop(self._waiters)
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self._active -= 1
+
+    @asynccontextmanager
+    async def slot(self, priority: Priority = Priority.READ):
+        """Hold a request slot for the context."""
+        start = monotonic()
+        await self._acquire(priority)
+        wait_time = monotonic() - start
+        self._scheduled += 1
+        self._total_wait_time += wait_time
+        self._max_wait_time = max(self._max_wait_time, wait_time)
+        try:
+            yield
+        finally:
+            self._release()
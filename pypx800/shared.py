@@ -0,0 +1,243 @@
+"""Share the IPX800 snapshots between processes in shared memory."""
+
+from __future__ import annotations
+
+import math
+import os
+import struct
+import sys
+from array import array
+from collections.abc import Callable
+from multiprocessing import resource_tracker, shared_memory
+from time import monotonic, sleep
+from typing import TYPE_CHECKING, cast
+
+from .snapshot import UNKNOWN, Bitset, IPX800Snapshot
+
+if TYPE_CHECKING:
+    from .coordinator import Change
+    from .ipx800 import IPX800
+
+MAGIC = b"PYPX800S"
+
+# Magic, sequence, timestamp and resource tracker of the creator, the sequence
+# is odd while a write is running
+HEADER = struct.Struct("<8sQdQ")
+SEQUENCE = struct.Struct("<Q")
+SEQUENCE_OFFSET = 8
+TIMESTAMP = struct.Struct("<d")
+TIMESTAMP_OFFSET = 16
+
+# Snapshot fields with their type code, "bits" for bitsets, and capacity, the
+# highest id plus one as ids start at 1 (128 virtual inputs, 32 virtual analog
+# inputs, 16 counters...)
+LAYOUT = (
+    ("relays", "bits", 64),
+    ("digital_inputs", "bits", 64),
+    ("virtual_inputs", "bits", 129),
+    ("virtual_outputs", "bits", 129),
+    ("dimmers_status", "bits", 32),
+    ("analog_inputs", "d", 8),
+    ("virtual_analog_inputs", "d", 33),
+    ("counters", "d", 17),
+    ("temperatures", "d", 16),
+    ("humidities", "d", 16),
+    ("luminosities", "d", 16),
+    ("dimmers_level", "B", 32),
+    ("covers", "B", 64),
+    ("fp_modes", "B", 64),
+    ("pwm_levels", "B", 32),
+)
+
+
+def _field_size(typecode: str, capacity: int) -> int:
+    """Return the bytes of a field."""
+    if typecode == "bits":
+        return (capacity + 7) // 8
+    return array(typecode).itemsize * capacity
+
+
+SIZE = HEADER.size + sum(_field_size(*field[1:]) for field in LAYOUT)
+
+
+def _tracker_id() -> int:
+    """Return the id of the resource tracker of the process, 0 if none is used."""
+    if os.name != "posix":
+        return 0
+    # processes started by multiprocessing share the pipe to the tracker
+    fd = resource_tracker.getfd()
+    return 0 if fd is None else os.fstat(fd).st_ino
+
+
+def _tracked_name(name: str) -> str:
+    """Return the name of a segment as registered in the resource tracker."""
+    # SharedMemory registers the POSIX name, with its leading slash
+    return f"/{name}" if os.name == "posix" else name
+
+
+def _known(typecode: str, value: float) -> bool:
+    """Return True if a stored number is not the unknown value of its array."""
+    return not math.isnan(value) if typecode == "d" else value != UNKNOWN
+
+
+def pack(snapshot: IPX800Snapshot) -> bytes:
+    """Return the fields of a snapshot in the fixed layout.
+
+    Raise ValueError if an id is above the capacity of its field.
+    """
+    data = bytearray()
+    for name, typecode, capacity in LAYOUT:
+        values = getattr(snapshot, name)
+        if typecode == "bits":
+            if any(values[index] for index in range(capacity, len(values))):
+                raise ValueError(f"{name} holds ids up to {capacity - 1}")
+            data += values.to_bytes(capacity)
+            continue
+        if any(_known(typecode, value) for value in values[capacity:]):
+            raise ValueError(f"{name} holds ids up to {capacity - 1}")
+        fill = math.nan if typecode == "d" else UNKNOWN
+        values = values[:capacity]
+        values.extend([fill] * (capacity - len(values)))
+        data += values.tobytes()
+    return bytes(data)
+
+
+def unpack(data: bytes, timestamp: float) -> IPX800Snapshot:
+    """Return the snapshot of fields in the fixed layout."""
+    snapshot = IPX800Snapshot(timestamp)
+    offset = 0
+    for name, typecode, capacity in LAYOUT:
+        size = _field_size(typecode, capacity)
+        chunk = data[offset : offset + size]
+        offset += size
+        if typecode == "bits":
+            setattr(snapshot, name, Bitset.from_bytes(chunk))
+        else:
+            values = array(typecode)
+            values.frombytes(chunk)
+            setattr(snapshot, name, values)
+    return snapshot
+
+
+class SharedSnapshot:
+    """IPX800 snapshot in a shared memory segment, for one writer process.
+
+    Readers never lock: they copy the segment into a new snapshot and retry
+    if the sequence changed meanwhile or was odd, meaning a write was running.
+    """
+
+    def __init__(self, name: str, create: bool = False) -> None:
+        """Attach to the segment name, or create it."""
+        self.name = name
+        if create:
+            self._memory = shared_memory.SharedMemory(name, create=True, size=SIZE)
+        elif sys.version_info >= (3, 13):
+            self._memory = shared_memory.SharedMemory(name, track=False)
+        else:
+            self._memory = shared_memory.SharedMemory(name)
+        self._owner = create
+        # the buffer of the segment, None only once closed
+        buffer = self._buffer = cast(memoryview, self._memory.buf)
+        if create:
+            buffer[: HEADER.size] = HEADER.pack(MAGIC, 0, 0, _tracker_id())
+        if bytes(buffer[: len(MAGIC)]) != MAGIC:
+            self._memory.close()
+            raise ValueError(f"{name} is not an IPX800 shared snapshot")
+        if not create and sys.version_info < (3, 13):
+            # only the creator may unlink the segment when exiting, but a tracker
+            # shared with it keeps one registration, which must stay
+            if HEADER.unpack_from(buffer)[3] != _tracker_id():
+                resource_tracker.unregister(
+                    _tracked_name(self._memory.name), "shared_memory"
+                )
+
+    @property
+    def sequence(self) -> int:
+        """Return the sequence, increased by 2 by each write."""
+        return SEQUENCE.unpack_from(self._buffer, SEQUENCE_OFFSET)[0]
+
+    def write(self, snapshot: IPX800Snapshot) -> None:
+        """Write a snapshot."""
+        data = pack(snapshot)
+        buffer = self._buffer
+        sequence = self.sequence
+        SEQUENCE.pack_into(buffer, SEQUENCE_OFFSET, sequence + 1)
+        buffer[HEADER.size : SIZE] = data
+        TIMESTAMP.pack_into(buffer, TIMESTAMP_OFFSET, snapshot.timestamp)
+        SEQUENCE.pack_into(buffer, SEQUENCE_OFFSET, sequence + 2)
+
+    def read(self, timeout: float = 1) -> IPX800Snapshot | None:
+        """Return the last snapshot written, None if there is none yet.
+
+        Raise TimeoutError if no consistent copy was made in timeout seconds,
+        like when the writer died while writing.
+        """
+        buffer = self._buffer
+        deadline = monotonic() + timeout
+        while True:
+            _magic, sequence, timestamp, _tracker = HEADER.unpack_from(buffer)
+            if not sequence & 1:
+                data = bytes(buffer[HEADER.size : SIZE])
+                if self.sequence == sequence:
+                    break
+            if monotonic() > deadline:
+                raise TimeoutError(f"{self.name} is being written for too long")
+            sleep(0)
+        if sequence == 0:
+            return None
+        return unpack(data, timestamp)
+
+    def close(self) -> None:
+        """Detach from the segment, and remove it if it was created here."""
+        self._memory.close()
+        if self._owner:
+            self._memory.unlink()
+
+    def __enter__(self):
+        """Enter."""
+        return self
+
+    def __exit__(self, *_exc_info) -> None:
+        """Exit."""
+        self.close()
+
+
+class SharedSnapshotPublisher:
+    """Write the polled values of an IPX800 to a shared snapshot.
+
+    A snapshot is written after each poll of the IPX800, changed or not, so
+    start_polling() must be called.
+    """
+
+    def __init__(self, ipx800: IPX800, name: str) -> None:
+        """Initialize object, the shared memory segment is created."""
+        self._ipx = ipx800
+        self.shared = SharedSnapshot(name, create=True)
+        self._remove_listener: Callable[[], None] | None = None
+
+    def _publish(self, _changes: list[Change]) -> None:
+        """Write a snapshot after each poll, its timestamp shows the poll ran."""
+        self.shared.write(IPX800Snapshot.from_values(self._ipx.coordinator.values))
+
+    def start(self) -> None:
+        """Start publishing the polled values."""
+        if self._remove_listener is None:
+            self._remove_listener = self._ipx.coordinator.add_poll_listener(
+                self._publish
+            )
+
+    async def stop(self) -> None:
+        """Stop publishing and remove the shared memory segment."""
+        if self._remove_listener is not None:
+            self._remove_listener()
+            self._remove_listener = None
+        self.shared.close()
+
+    async def __aenter__(self):
+        """Async enter."""
+        self.start()
+        return self
+
+    async def __aexit__(self, *_exc_info) -> None:
+        """Async exit."""
+        await self.stop()
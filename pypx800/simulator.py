@@ -0,0 +1,220 @@
+"""Local IPX800 v4 simulator, to test and benchmark without a controller."""
+
+import asyncio
+import random
+
+from aiohttp import BasicAuth, web
+
+from .cache import key_in_group
+
+RELAYS = 56
+DIGITAL_INPUTS = 56
+ANALOG_INPUTS = 4
+VIRTUAL_ANALOG_INPUTS = 32
+VIRTUAL_INPUTS = 128
+VIRTUAL_OUTPUTS = 128
+COUNTERS = 16
+XDIMMERS = 24
+X4VR_EXTENSIONS = 4
+X4FP_EXTENSIONS = 4
+XTHLS = 4
+XPWM_CHANNELS = 24
+
+
+class IPX800Simulator:
+    """Fake IPX800 v4 serving the JSON and CGI APIs with a realistic state."""
+
+    def __init__(
+        self,
+        api_key: str = "apikey",
+        username: str | None = None,
+        password: str | None = None,
+        latency: float = 0,
+        latency_jitter: float = 0,
+        failure_rate: float = 0,
+        timeout_rate: float = 0,
+    ) -> None:
+        """Init the simulator.
+
+        failure_rate is the part of the requests answered with an error status,
+        timeout_rate the part never answered.
+        """
+        self.api_key = api_key
+        self.username = username
+        self.password = password
+        self.latency = latency
+        self.latency_jitter = latency_jitter
+        self.failure_rate = failure_rate
+        self.timeout_rate = timeout_rate
+        self.requests = 0
+        self.state = self.default_state()
+        self._runner: web.AppRunner | None = None
+        self.port: int | None = None
+
+        self.app = web.Application()
+        self.app.router.add_get("/api/xdevices.json", self._handle_api)
+        self.app.router.add_get("/user/api.cgi", self._handle_cgi)
+
+    @staticmethod
+    def default_state() -> dict:
+        """Return the values of a freshly started IPX800."""
+        state: dict = {}
+        state.update({f"R{i}": 0 for i in range(1, RELAYS + 1)})
+        state.update({f"D{i}": 0 for i in range(1, DIGITAL_INPUTS + 1)})
+        state.update({f"A{i}": 0 for i in range(1, ANALOG_INPUTS + 1)})
+        state.update({f"VA{i}": 0 for i in range(1, VIRTUAL_ANALOG_INPUTS + 1)})
+        state.update({f"VI{i}": 0 for i in range(1, VIRTUAL_INPUTS + 1)})
+        state.update({f"VO{i}": 0 for i in range(1, VIRTUAL_OUTPUTS + 1)})
+        state.update({f"C{i}": 0 for i in range(1, COUNTERS + 1)})
+        state.update(
+            {f"G{i}": {"Etat": "OFF", "Valeur": 0} for i in range(1, XDIMMERS + 1)}
+        )
+        for ext in range(1, X4VR_EXTENSIONS + 1):
+            state.update({f"VR{ext}-{vr}": 100 for vr in range(1, 5)})
+        for ext in range(1, X4FP_EXTENSIONS + 1):
+            state.update({f"FP{ext} Zone {zone}": 0 for zone in range(1, 5)})
+        for xthl in range(1, XTHLS + 1):
+            state.update(
+                {
+                    f"THL{xthl}-TEMP": 20.5,
+                    f"THL{xthl}-HUM": 45.2,
+                    f"THL{xthl}-LUM": 300,
+                }
+            )
+        state.update({f"PWM{i}": 0 for i in range(1, XPWM_CHANNELS + 1)})
+        return state
+
+    @property
+    def url(self) -> str:
+        """Return the base URL of the simulator."""
+        return f"http://127.0.0.1:{self.port}"
+
+    def group(self, group: str) -> dict:
+        """Return the values answered to a Get=group request."""
+        return {
+            key: value for key, value in self.state.items() if key_in_group(key, group)
+        }
+
+    def _set_binary(self, prefix: str, action: str, value: str) -> None:
+        """Set, clear or toggle a relay, a virtual input or output."""
+        key = f"{prefix}{int(value)}"
+        if action == "Set":
+            self.state[key] = 1
+        elif action == "Clear":
+            self.state[key] = 0
+        else:
+            self.state[key] = 1 - self.state[key]
+
+    def _set_counter(self, key: str, value: str) -> None:
+        """Set, increment or decrement a counter."""
+        if value.startswith(("+", "-")):
+            self.state[key] += int(value)
+        else:
+            self.state[key] = int(value)
+
+    def command(self, name: str, value: str) -> None:
+        """Apply a JSON API command to the state."""
+        for action in ("Set", "Clear", "Toggle"):
+            for prefix in ("R", "VI", "VO"):
+                if name == f"{action}{prefix}":
+                    self._set_binary(prefix, action, value)
+                    return
+        if name.startswith("SetC"):
+            self._set_counter(f"C{int(name[4:])}", value)
+        elif name.startswith("SetVA"):
+            self.state[f"VA{int(name[5:])}"] = float(value)
+        elif name.startswith("SetG"):
+            level = int(value)
+            self.state[f"G{int(name[4:])}"] = {
+                "Etat": "ON" if level else "OFF",
+                "Valeur": 100 if level == 101 else level,
+            }
+        elif name.startswith("SetVR"):
+            number = int(name[5:]) - 1
+            if int(value) <= 100:
+                self.state[f"VR{number // 4 + 1}-{number % 4 + 1}"] = int(value)
+        elif name.startswith("SetFP"):
+            number = int(name[5:])
+            zones = (
+                [key for key in self.state if key.startswith("FP")]
+                if number == 0
+                else [f"FP{(number - 1) // 4 + 1} Zone {(number - 1) % 4 + 1}"]
+            )
+            for key in zones:
+                self.state[key] = int(value)
+        elif name.startswith(("SetPulseUP", "SetPulseDOWN")):
+            down = name.startswith("SetPulseDOWN")
+            number = int(name.removeprefix("SetPulseDOWN" if down else "SetPulseUP"))
+            key = f"VR{(number - 1) // 4 + 1}-{(number - 1) % 4 + 1}"
+            step = int(value) if down else -int(value)
+            self.state[key] = min(max(self.state[key] + step, 0), 100)
+
+    async def _simulate_network(self) -> bool:
+        """Wait the latency, return False if the request must fail."""
+        self.requests += 1
+        if self.timeout_rate and random.random() < self.timeout_rate:
+            await asyncio.Event().wait()
+        delay = self.latency + random.uniform(0, self.latency_jitter)
+        if delay:
+            await asyncio.sleep(delay)
+        return not (self.failure_rate and random.random() < self.failure_rate)
+
+    async def _handle_api(self, request: web.Request) -> web.Response:
+        """Answer the JSON API."""
+        answer: dict = {"product": "IPX800_V4"}
+        if not await self._simulate_network() or (
+            request.query.get("key") != self.api_key
+        ):
+            answer["status"] = "Error"
+            return web.json_response(answer)
+        for name, value in request.query.items():
+            if name == "Get":
+                answer.update(self.group(value))
+            elif name not in ("key", "Time"):
+                self.command(name, value)
+        answer["status"] = "Success"
+        return web.json_response(answer)
+
+    async def _handle_cgi(self, request: web.Request) -> web.Response:
+        """Answer the CGI API, used for the X-PWM commands."""
+        if self.username and self.password:
+            header = request.headers.get("Authorization", "")
+            try:
+                auth = BasicAuth.decode(header)
+            except ValueError:
+                auth = None
+            if auth is None or (auth.login, auth.password) != (
+                self.username,
+                self.password,
+            ):
+                return web.Response(status=401, text="Unauthorized")
+        if not await self._simulate_network():
+            return web.Response(text="Error")
+        if "SetPWM" in request.query:
+            self.state[f"PWM{int(request.query['SetPWM'])}"] = int(
+                request.query.get("PWMValue", 0)
+            )
+        return web.Response(text="Success")
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> None:
+        """Start serving, on a free port if port is 0."""
+        self._runner = web.AppRunner(self.app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        self.port = self._runner.addresses[0][1]
+
+    async def stop(self) -> None:
+        """Stop serving."""
+        if self._runner:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def __aenter__(self):
+        """Async enter."""
+        await self.start()
+        return self
+
+    async def __aexit__(self, *_exc_info) -> None:
+        """Async exit."""
+        await self.stop()
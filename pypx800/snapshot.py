@@ -0,0 +1,227 @@
+"""Compact typed snapshot of the IPX800 values."""
+
+from __future__ import annotations
+
+import math
+import re
+from array import array
+from time import time
+
+# Byte value of an unknown level, cover position, X-4FP mode or X-PWM level
+UNKNOWN = 255
+
+KEY_PATTERN = re.compile(
+    r"(R|D|A|VA|VI|VO|C|G|PWM|THL|VR|FP)(\d+)(?:-(\d+|TEMP|HUM|LUM)| Zone (\d+))?$"
+)
+
+
+class Bitset:
+    """Booleans indexed by entity id, packed in bytes."""
+
+    __slots__ = ("_bits",)
+
+    def __init__(self, size: int = 0) -> None:
+        """Initialize object."""
+        self._bits = bytearray((size + 8) // 8)
+
+    def __len__(self) -> int:
+        """Return the number of ids which can be stored."""
+        return len(self._bits) * 8
+
+    def __getitem__(self, index: int) -> bool:
+        """Return the boolean of an id, False if never set."""
+        if index >= len(self._bits) * 8:
+            return False
+        return bool(self._bits[index >> 3] & (1 << (index & 7)))
+
+    def to_bytes(self, size: int) -> bytes:
+        """Return the booleans of the ids lower than size, packed in bytes."""
+        length = (size + 7) // 8
+        return bytes(self._bits[:length]).ljust(length, b"\0")
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> Bitset:
+        """Return a bitset of booleans packed in bytes."""
+        bitset = cls()
+        bitset._bits = bytearray(data)
+        return bitset
+
+    def __setitem__(self, index: int, value: bool) -> None:
+        """Set the boolean of an id."""
+        if index >= len(self._bits) * 8:
+            self._bits.extend(bytes(index // 8 + 1 - len(self._bits)))
+        if value:
+            self._bits[index >> 3] |= 1 << (index & 7)
+        else:
+            self._bits[index >> 3] &= ~(1 << (index & 7)) & 0xFF
+
+
+def _store(values: array, index: int, value) -> None:
+    """Store a value at index, growing the array with unknown values."""
+    if index >= len(values):
+        fill = math.nan if values.typecode == "d" else UNKNOWN
+        values.extend([fill] * (index + 1 - len(values)))
+    values[index] = value if values.typecode == "d" else int(value)
+
+
+def _load(values: array, index: int):
+    """Return the value at index, None if unknown."""
+    if index >= len(values):
+        return None
+    value = values[index]
+    if value == UNKNOWN and values.typecode == "B":
+        return None
+    if values.typecode == "d" and math.isnan(value):
+        return None
+    return value
+
+
+class IPX800Snapshot:
+    """Values of an IPX800 at a time, in bitsets and numeric arrays.
+
+    Entities are indexed by their id, X-4VR and X-4FP by their number
+    (ext_id - 1) * 4 + vr_id or zone_id, like for the commands.
+    """
+
+    __slots__ = (
+        "timestamp",
+        "relays",
+        "digital_inputs",
+        "virtual_inputs",
+        "virtual_outputs",
+        "analog_inputs",
+        "virtual_analog_inputs",
+        "counters",
+        "dimmers_status",
+        "dimmers_level",
+        "covers",
+        "fp_modes",
+        "pwm_levels",
+        "temperatures",
+        "humidities",
+        "luminosities",
+    )
+
+    def __init__(self, timestamp: float | None = None) -> None:
+        """Initialize an empty snapshot."""
+        self.timestamp = time() if timestamp is None else timestamp
+        self.relays = Bitset()
+        self.digital_inputs = Bitset()
+        self.virtual_inputs = Bitset()
+        self.virtual_outputs = Bitset()
+        self.analog_inputs = array("d")
+        self.virtual_analog_inputs = array("d")
+        self.counters = array("d")
+        self.dimmers_status = Bitset()
+        self.dimmers_level = array("B")
+        self.covers = array("B")
+        self.fp_modes = array("B")
+        self.pwm_levels = array("B")
+        self.temperatures = array("d")
+        self.humidities = array("d")
+        self.luminosities = array("d")
+
+    @classmethod
+    def from_values(
+        cls, values: dict, timestamp: float | None = None
+    ) -> IPX800Snapshot:
+        """Build a snapshot from an API answer or global_get() values."""
+        snapshot = cls(timestamp)
+        bitsets = {
+            "R": snapshot.relays,
+            "D": snapshot.digital_inputs,
+            "VI": snapshot.virtual_inputs,
+            "VO": snapshot.virtual_outputs,
+        }
+        numbers = {
+            "A": snapshot.analog_inputs,
+            "VA": snapshot.virtual_analog_inputs,
+            "C": snapshot.counters,
+            "PWM": snapshot.pwm_levels,
+        }
+        xthl = {
+            "TEMP": snapshot.temperatures,
+            "HUM": snapshot.humidities,
+            "LUM": snapshot.luminosities,
+        }
+        for key, value in values.items():
+            match = KEY_PATTERN.match(key)
+            if match is None:
+                continue
+            family, number, suffix, zone = match.groups()
+            index = int(number)
+            if family in bitsets:
+                bitsets[family][index] = value == 1
+            elif family in numbers:
+                _store(numbers[family], index, value)
+            elif family == "G":
+                snapshot.dimmers_status[index] = value["Etat"] == "ON"
+                _store(snapshot.dimmers_level, index, value["Valeur"])
+            elif family == "THL" and suffix in xthl:
+                _store(xthl[suffix], index, value)
+            elif family == "VR" and suffix:
+                _store(snapshot.covers, (index - 1) * 4 + int(suffix), value)
+            elif family == "FP" and zone:
+                _store(snapshot.fp_modes, (index - 1) * 4 + int(zone), value)
+        return snapshot
+
+    def relay(self, relay_id: int) -> bool:
+        """Return a relay status."""
+        return self.relays[relay_id]
+
+    def digital_input(self, digital_id: int) -> bool:
+        """Return a digital input value."""
+        return self.digital_inputs[digital_id]
+
+    def virtual_input(self, virtual_id: int) -> bool:
+        """Return a virtual input status."""
+        return self.virtual_inputs[virtual_id]
+
+    def virtual_output(self, virtual_id: int) -> bool:
+        """Return a virtual output status."""
+        return self.virtual_outputs[virtual_id]
+
+    def analog_input(self, analog_id: int) -> float | None:
+        """Return an analog input value."""
+        return _load(self.analog_inputs, analog_id)
+
+    def virtual_analog_input(self, virtual_analog_id: int) -> float | None:
+        """Return a virtual analog input value."""
+        return _load(self.virtual_analog_inputs, virtual_analog_id)
+
+    def counter(self, counter_id: int) -> float | None:
+        """Return a counter value."""
+        return _load(self.counters, counter_id)
+
+    def dimmer_status(self, dimmer_id: int) -> bool:
+        """Return a X-Dimmer status."""
+        return self.dimmers_status[dimmer_id]
+
+    def dimmer_level(self, dimmer_id: int) -> int | None:
+        """Return a X-Dimmer level."""
+        return _load(self.dimmers_level, dimmer_id)
+
+    def cover_level(self, ext_id: int, vr_id: int) -> int | None:
+        """Return a X-4VR level, 100 when open as for X4VR.level."""
+        value = _load(self.covers, (ext_id - 1) * 4 + vr_id)
+        return None if value is None else 100 - value
+
+    def fp_mode(self, ext_id: int, zone_id: int) -> int | None:
+        """Return a X-4FP zone mode."""
+        return _load(self.fp_modes, (ext_id - 1) * 4 + zone_id)
+
+    def pwm_level(self, channel_id: int) -> int | None:
+        """Return a X-PWM channel level."""
+        return _load(self.pwm_levels, channel_id)
+
+    def temperature(self, xthl_id: int) -> float | None:
+        """Return a X-THL temperature."""
+        return _load(self.temperatures, xthl_id)
+
+    def humidity(self, xthl_id: int) -> float | None:
+        """Return a X-THL humidity."""
+        return _load(self.humidities, xthl_id)
+
+    def luminosity(self, xthl_id: int) -> float | None:
+        """Return a X-THL luminosity."""
+        return _load(self.luminosities, xthl_id)
@@ -0,0 +1,124 @@
+"""Blocking client running the IPX800 in a background event loop."""
+
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import inspect
+import threading
+from collections.abc import Awaitable, Callable
+from functools import partial
+from typing import Any
+
+from .ipx800 import IPX800
+
+
+class SyncProxy:
+    """Blocking proxy of an object living in a background event loop.
+
+    Coroutine methods become blocking methods and awaitable properties are
+    awaited, other attributes are returned as they are.
+    """
+
+    def __init__(self, client: SyncIPX800, target: Any) -> None:
+        """Initialize object."""
+        self._client = client
+        self._target = target
+
+    def __getattr__(self, name: str):
+        """Return an attribute of the target, blocking for coroutines."""
+        if name.startswith("_"):
+            raise AttributeError(name)
+        attribute = getattr(type(self._target), name, None)
+        if isinstance(attribute, property) and inspect.iscoroutinefunction(
+            attribute.fget
+        ):
+            return self._client.run(attribute.fget(self._target))
+        value = getattr(self._target, name)
+        if inspect.iscoroutinefunction(value):
+            return partial(self._client.call, value)
+        return value
+
+    def __repr__(self) -> str:
+        """Return the representation of the target."""
+        return f"<{type(self).__name__} {self._target!r}>"
+
+
+class SyncIPX800(SyncProxy):
+    """Blocking IPX800 client, usable from many threads at once.
+
+    All calls run in one background event loop thread sharing the IPX800
+    session, so connections are kept alive between calls.
+    """
+
+    def __init__(
+        self, host: str, api_key: str, timeout: float | None = None, **kwargs
+    ) -> None:
+        """Initialize object, kwargs are the IPX800 ones.
+
+        timeout is the max time in seconds a blocking call waits.
+        """
+        self.timeout = timeout
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._loop.run_forever, name=f"pypx800-{host}", daemon=True
+        )
+        self._thread.start()
+        super().__init__(self, self._run_in_loop(IPX800, host, api_key, **kwargs))
+
+    @property
+    def ipx(self) -> IPX800:
+        """Return the IPX800, to be used in the background event loop only."""
+        return self._target
+
+    def run(self, awaitable: Awaitable):
+        """Wait for an awaitable run in the background event loop.
+
+        It is cancelled if it did not finish within the timeout.
+        """
+        future = asyncio.run_coroutine_threadsafe(_awaited(awaitable), self._loop)
+        try:
+            return future.result(self.timeout)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            raise
+
+    def call(self, function: Callable[..., Awaitable], *args, **kwargs):
+        """Wait for a coroutine function called in the background event loop."""
+        return self.run(function(*args, **kwargs))
+
+    def _run_in_loop(self, function: Callable, *args, **kwargs):
+        """Call a function in the background event loop and return its result."""
+
+        async def call():
+            return function(*args, **kwargs)
+
+        return self.run(call())
+
+    def entity(self, entity_class: type, *args, **kwargs) -> SyncProxy:
+        """Return a blocking entity, like entity(Relay, 1)."""
+        return SyncProxy(
+            self, self._run_in_loop(entity_class, self._target, *args, **kwargs)
+        )
+
+    def close(self) -> None:
+        """Close the IPX800 session and stop the background event loop."""
+        if not self._loop.is_running():
+            return
+        self.run(self._target.close())
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+    def __enter__(self):
+        """Enter."""
+        return self
+
+    def __exit__(self, *_exc_info) -> None:
+        """Exit."""
+        self.close()
+
+
+async def _awaited(awaitable: Awaitable):
+    """Await an awaitable, to schedule any of them as a coroutine."""
+    return await awaitable
@@ -6,24 +6,37 @@ from .ipx800 import IPX800
 class VAInput:
     """Representing an IPX800 Virtual Analog Input."""
 
-    def __init__(self, ipx800: IPX800, virtual_analog_id: int) -> None:
-        """Initialize object."""
+    def __init__(
+        self, ipx800: IPX800, virtual_analog_id: int, coalesce_writes: bool = False
+    ) -> None:
+        """Initialize object, see WriteCoalescer for coalesce_writes."""
         self._ipx = ipx800
         self.id = virtual_analog_id
+        self.coalesce_writes = coalesce_writes
+        ipx800.register(self)
 
     @property
     def key(self) -> str:
         """Return the key to get the value from API call."""
         return f"VA{self.id}"
 
+    @property
+    def group(self) -> str:
+        """Return the group to get the value from API call."""
+        return "VA"
+
     @property
     async def value(self) -> float:
         """Get Analog Input value."""
-        params = {"Get": "VA"}
+        params = {"Get": self.group}
         response = await self._ipx.request_api(params)
         return response[self.key]
 
     async def set_value(self, value: float) -> None:
         """Set Virtual Analog input value."""
         params = {f"SetVA{self.id:02}": value}
-        await self._ipx.request_api(params)
+        await self._ipx.request_api(
+            params,
+            state={self.key: value},
+            channel=self.key if self.coalesce_writes else None,
+        )
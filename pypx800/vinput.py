@@ -10,30 +10,38 @@ class VInput:
         """Initialize object."""
         self._ipx = ipx800
         self.id = relay_id
+        ipx800.register(self)
 
     @property
     def key(self) -> str:
         """Return the key to get the value from API call."""
         return f"VI{self.id}"
 
+    @property
+    def group(self) -> str:
+        """Return the group to get the value from API call."""
+        return "VI"
+
     @property
     async def status(self) -> bool:
         """Get status of a Virtual Input."""
-        params = {"Get": "VI"}
+        params = {"Get": self.group}
         response = await self._ipx.request_api(params)
         return response[self.key] == 1
 
     async def on(self) -> None:
         """Turn on a Virtual Input."""
         params = {"SetVI": self.id}
-        await self._ipx.request_api(params)
+        await self._ipx.request_api(params, state={self.key: 1})
 
     async def off(self) -> None:
         """Turn off a Virtual Input."""
         params = {"ClearVI": self.id}
-        await self._ipx.request_api(params)
+        await self._ipx.request_api(params, state={self.key: 0})
 
     async def toggle(self) -> None:
         """Toggle a Virtual Input."""
         params = {"ToggleVI": self.id}
-        await self._ipx.request_api(params)
+        value = self._ipx.cache.value(self.key)
+        state = None if value is None else {self.key: 1 - value}
+        await self._ipx.request_api(params, state=state)
@@ -10,30 +10,38 @@ class VOutput:
         """Initialize object."""
         self._ipx = ipx800
         self.id = relay_id
+        ipx800.register(self)
 
     @property
     def key(self) -> str:
         """Return the key to get the value from API call."""
         return f"VO{self.id}"
 
+    @property
+    def group(self) -> str:
+        """Return the group to get the value from API call."""
+        return "VO"
+
     @property
     async def status(self) -> bool:
         """Get status of a Virtual Output."""
-        params = {"Get": "VO"}
+        params = {"Get": self.group}
         response = await self._ipx.request_api(params)
         return response[self.key] == 1
 
     async def on(self) -> None:
         """Turn on a Virtual Output."""
         params = {"SetVO": self.id}
-        await self._ipx.request_api(params)
+        await self._ipx.request_api(params, state={self.key: 1})
 
     async def off(self) -> None:
         """Turn off a Virtual Output."""
         params = {"ClearVO": self.id}
-        await self._ipx.request_api(params)
+        await self._ipx.request_api(params, state={self.key: 0})
 
     async def toggle(self) -> None:
         """Toggle a Virtual Output."""
         params = {"ToggleVO": self.id}
-        await self._ipx.request_api(params)
+        value = self._ipx.cache.value(self.key)
+        state = None if value is None else {self.key: 1 - value}
+        await self._ipx.request_api(params, state=state)
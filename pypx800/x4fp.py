@@ -12,23 +12,29 @@ class X4FP:
         self.ext_id = ext_id
         self.zone_id = zone_id
         self.fp_number = (ext_id - 1) * 4 + zone_id
+        ipx800.register(self)
 
     @property
     def key(self) -> str:
         """Return the key to get the value from API call."""
         return f"FP{self.ext_id} Zone {self.zone_id}"
 
+    @property
+    def group(self) -> str:
+        """Return the group to get the value from API call."""
+        return "FP"
+
     @property
     async def status(self) -> bool:
         """Return the current FP status."""
-        params = {"Get": "FP"}
+        params = {"Get": self.group}
         response = await self._ipx.request_api(params)
         return response[self.key]
 
     async def set_mode(self, mode) -> None:
         """Set FP mode."""
         params = {f"SetFP{self.fp_number:02}": mode}
-        await self._ipx.request_api(params)
+        await self._ipx.request_api(params, state={self.key: mode})
 
     async def set_mode_all(self, mode) -> None:
         """Set FP mode for all zones."""
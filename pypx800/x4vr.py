@@ -1,63 +1,120 @@
 """IPX800 X-4VR."""
 
 from .ipx800 import IPX800
+from .motion import CoverMotion
 
 
 class X4VR:
     """Representing an X-4VR output."""
 
-    def __init__(self, ipx800: IPX800, ext_id: int, vr_id: int) -> None:
-        """Initialize object."""
+    def __init__(
+        self,
+        ipx800: IPX800,
+        ext_id: int,
+        vr_id: int,
+        coalesce_writes: bool = False,
+        travel_time: float | None = None,
+        pulse_time: float = 1,
+    ) -> None:
+        """Initialize object.
+
+        See WriteCoalescer for coalesce_writes. With travel_time, the seconds
+        the cover takes to fully open, the level is estimated while it moves
+        instead of read.
+        """
         self._ipx = ipx800
         self.ext_id = ext_id
         self.vr_id = vr_id
+        self.coalesce_writes = coalesce_writes
         self.vr_number = (ext_id - 1) * 4 + vr_id
+        self.motion = CoverMotion(travel_time, pulse_time) if travel_time else None
+        ipx800.register(self)
 
     @property
     def key(self) -> str:
         """Return the key to get the value from API call."""
         return f"VR{self.ext_id}-{self.vr_id}"
 
+    @property
+    def group(self) -> str:
+        """Return the group to get the value from API call."""
+        return f"VR{self.ext_id}"
+
+    def _known_level(self) -> int | None:
+        """Return the last level received or set, None if unknown."""
+        value = self._ipx.cache.value(self.key)
+        if not isinstance(value, int) or value > 100:
+            return None
+        return 100 - value
+
+    async def _read_level(self) -> int:
+        """Return the level estimated while moving, else read from the API."""
+        if self.motion is not None and self.motion.moving():
+            return round(self.motion.level())
+        params = {"Get": self.group}
+        response = await self._ipx.request_api(params)
+        level = 100 - int(response[self.key])
+        if self.motion is not None:
+            self.motion.confirm(level)
+        return level
+
     @property
     async def status(self) -> bool:
         """Return the current cover status."""
-        params = {"Get": f"VR{self.ext_id}"}
-        response = await self._ipx.request_api(params)
-        return response[self.key] < 100
+        return await self._read_level() > 0
 
     @property
     async def level(self) -> int:
         """Return the current cover level."""
-        params = {"Get": f"VR{self.ext_id}"}
-        response = await self._ipx.request_api(params)
-        return 100 - int(response[self.key])
+        return await self._read_level()
 
     async def on(self) -> None:
         """Open cover."""
+        start = self._known_level()
         params = {f"SetVR{self.vr_number:02}": "0"}
-        await self._ipx.request_api(params)
+        await self._ipx.request_api(params, state={self.key: 0})
+        if self.motion is not None:
+            self.motion.move(100, start)
 
     async def off(self) -> None:
         """Close cover."""
+        start = self._known_level()
         params = {f"SetVR{self.vr_number:02}": "100"}
-        await self._ipx.request_api(params)
+        await self._ipx.request_api(params, state={self.key: 100})
+        if self.motion is not None:
+            self.motion.move(0, start)
 
     async def stop(self) -> None:
         """Stop cover."""
         params = {f"SetVR{self.vr_number:02}": "101"}
         await self._ipx.request_api(params)
+        if self.motion is not None:
+            self.motion.stop()
 
     async def set_level(self, level: int) -> None:
         """Set cover level."""
+        start = self._known_level()
         params = {f"SetVR{self.vr_number:02}": str(100 - level)}
-        await self._ipx.request_api(params)
+        await self._ipx.request_api(
+            params,
+            state={self.key: 100 - level},
+            channel=self.key if self.coalesce_writes else None,
+        )
+        if self.motion is not None:
+            self.motion.move(level, start)
 
     async def set_pulse_down(self, impulse: int) -> None:
         """Set cover impulse down."""
+        start = self._known_level()
         params = {f"SetPulseDOWN{self.vr_number:02}": str(impulse)}
         await self._ipx.request_api(params)
+        if self.motion is not None:
+            self.motion.pulse(impulse, False, start)
 
     async def set_pulse_up(self, impulse: int) -> None:
         """Set cover impulse up."""
+        start = self._known_level()
         params = {f"SetPulseUP{self.vr_number:02}": str(impulse)}
         await self._ipx.request_api(params)
+        if self.motion is not None:
+            self.motion.pulse(impulse, True, start)
@@ -8,42 +8,56 @@ DEFAULT_TRANSITION = 500
 class XDimmer:
     """Representing an X-Dimmer out."""
 
-    def __init__(self, ipx800: IPX800, relay_id: int) -> None:
-        """Initialize object."""
+    def __init__(
+        self, ipx800: IPX800, relay_id: int, coalesce_writes: bool = False
+    ) -> None:
+        """Initialize object, see WriteCoalescer for coalesce_writes."""
         self._ipx = ipx800
         self.id = relay_id
+        self.coalesce_writes = coalesce_writes
+        ipx800.register(self)
 
     @property
     def key(self) -> str:
         """Return the key to get the value from API call."""
         return f"G{self.id}"
 
+    @property
+    def group(self) -> str:
+        """Return the group to get the value from API call."""
+        return "G"
+
     @property
     async def status(self) -> bool:
         """Return the current X-Dimmer status."""
-        params = {"Get": "G"}
+        params = {"Get": self.group}
         response = await self._ipx.request_api(params)
         return response[self.key]["Etat"] == "ON"
 
     @property
     async def level(self) -> int:
         """Return the current X-Dimmer level."""
-        params = {"Get": "G"}
+        params = {"Get": self.group}
         response = await self._ipx.request_api(params)
         return response[self.key]["Valeur"]
 
     async def on(self, time: int = DEFAULT_TRANSITION) -> None:
         """Turn on a X-Dimmer."""
         params = {f"SetG{self.id:02}": "101", "Time": time}
-        await self._ipx.request_api(params)
+        level = self._ipx.cache.value(self.key, {}).get("Valeur") or 100
+        await self._ipx.request_api(
+            params, state={self.key: {"Etat": "ON", "Valeur": level}}
+        )
 
     async def off(self, time: int = DEFAULT_TRANSITION) -> None:
         """Turn off a X-Dimmer."""
         params = {f"SetG{self.id:02}": "0", "Time": time}
-        await self._ipx.request_api(params)
+        await self._ipx.request_api(
+            params, state={self.key: {"Etat": "OFF", "Valeur": 0}}
+        )
 
     async def toggle(self, time: int = DEFAULT_TRANSITION) -> None:
-        """Toggle a X-Dimmer."""
+        """Toggle a X-Dimmer, from its cached status while still fresh."""
         if await self.status:
             await self.off(time)
         else:
@@ -52,4 +66,8 @@ class XDimmer:
     async def set_level(self, level: int, time: int = DEFAULT_TRANSITION) -> None:
         """Turn on a X-Dimmer on a specific level."""
         params = {f"SetG{self.id:02}": level, "Time": time}
-        await self._ipx.request_api(params)
+        await self._ipx.request_api(
+            params,
+            state={self.key: {"Etat": "ON" if level else "OFF", "Valeur": level}},
+            channel=self.key if self.coalesce_writes else None,
+        )
@@ -8,27 +8,36 @@ DEFAULT_TRANSITION = 500
 class XPWM:
     """Representing an X-PWM channel."""
 
-    def __init__(self, ipx800: IPX800, channel_id: int) -> None:
-        """Initialize object."""
+    def __init__(
+        self, ipx800: IPX800, channel_id: int, coalesce_writes: bool = False
+    ) -> None:
+        """Initialize object, see WriteCoalescer for coalesce_writes."""
         self._ipx = ipx800
         self.id = channel_id
+        self.coalesce_writes = coalesce_writes
+        ipx800.register(self)
 
     @property
     def key(self) -> str:
         """Return the key to get the value from API call."""
         return f"PWM{self.id}"
 
+    @property
+    def group(self) -> str:
+        """Return the group to get the value from API call."""
+        return f"XPWM|{self.id}"
+
     @property
     async def status(self) -> bool:
         """Return the current X-PWM status."""
-        params = {"Get": f"XPWM|{self.id}"}
+        params = {"Get": self.group}
         response = await self._ipx.request_api(params)
         return response[self.key] > 0
 
     @property
     async def level(self) -> int:
         """Return the current X-PWM level."""
-        params = {"Get": f"XPWM|{self.id}"}
+        params = {"Get": self.group}
         response = await self._ipx.request_api(params)
         return response[self.key]
 
@@ -41,16 +50,16 @@ class XPWM:
     async def on(self, time: int = DEFAULT_TRANSITION) -> None:
         """Turn on a X-PWM."""
         params = {"SetPWM": self.id, "PWMValue": "100", "PWMDelay": time}
-        await self._ipx.request_cgi(params)
+        await self._ipx.request_cgi(params, state={self.key: 100})
 
     async def off(self, time: int = DEFAULT_TRANSITION) -> None:
         """Turn off a X-PWM."""
         params = {"SetPWM": self.id, "PWMValue": "0", "PWMDelay": time}
-        await self._ipx.request_cgi(params)
+        await self._ipx.request_cgi(params, state={self.key: 0})
 
     async def toggle(self, time: int = DEFAULT_TRANSITION) -> None:
-        """Toggle a X-PWM."""
-        if self.status:
+        """Toggle a X-PWM, from its cached level while still fresh."""
+        if await self.status:
             await self.off(time)
         else:
             await self.on(time)
@@ -58,4 +67,8 @@ class XPWM:
     async def set_level(self, level, time: int = DEFAULT_TRANSITION) -> None:
         """Turn on a X-PWM."""
         params = {"SetPWM": self.id, "PWMValue": level, "PWMDelay": time}
-        await self._ipx.request_cgi(params)
+        await self._ipx.request_cgi(
+            params,
+            state={self.key: int(level)},
+            channel=self.key if self.coalesce_writes else None,
+        )
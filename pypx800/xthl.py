@@ -18,29 +18,35 @@ class XTHL:
         """Initialize object."""
         self._ipx = ipx800
         self.id = xthl_id
+        ipx800.register(self)
 
     # @property
     def key(self, sensor_type: XTHLTypes) -> str:
         """Return the key to get the value from API call."""
         return f"THL{self.id}-{sensor_type.value}"
 
+    @property
+    def group(self) -> str:
+        """Return the group to get the value from API call."""
+        return "XTHL"
+
     @property
     async def temp(self) -> float:
         """Get temperature of the X-THL."""
-        params = {"Get": "XTHL"}
+        params = {"Get": self.group}
         response = await self._ipx.request_api(params)
         return response[self.key(sensor_type=XTHLTypes.Temperature)]
 
     @property
     async def hum(self) -> float:
         """Get humidity level of the X-THL."""
-        params = {"Get": "XTHL"}
+        params = {"Get": self.group}
         response = await self._ipx.request_api(params)
         return response[self.key(XTHLTypes.Humidity)]
 
     @property
     async def lum(self) -> int:
         """Get luminosity level of the X-THL."""
-        params = {"Get": "XTHL"}
+        params = {"Get": self.group}
         response = await self._ipx.request_api(params)
         return response[self.key(XTHLTypes.Luminosity)]
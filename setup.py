@@ -15,6 +15,7 @@ setuptools.setup(
     long_description_content_type="text/markdown",
     url="https://github.com/aohzan/pypx800",
     packages=setuptools.find_packages(),
+    entry_points={"console_scripts": ["pypx800 = pypx800.cli:main"]},
     classifiers=[
         "Programming Language :: Python :: 3",
         "License :: OSI Approved :: MIT License",